@@ -2,9 +2,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
+import logging
+import threading
+import click
 from flask import Flask, abort, redirect, request
 from config import Config
-from db.mongo import mongo
+from db.mongo import client_options, mongo
+from db.indexes import ensure_indexes
+from utils.counters import reconcile_counts
+from utils.dates import migrate_article_dates
+from utils.json_provider import FastJSONProvider
+from utils.recent import warm_recent
+from utils.related import refresh_related
+from utils.typeahead import load_typeahead
 from routes.article_routes import article_bp
 from routes.pages import pages_bp
 
@@ -21,7 +31,49 @@ from routes.admin_routes import admin_bp
 app = Flask(__name__)
 app.config.from_object(Config)
 
-mongo.init_app(app)
+mongo.init_app(app, **client_options())
+
+# After init_app, which installs flask-pymongo's own provider
+app.json = FastJSONProvider(app)
+
+
+@app.cli.command("create-indexes")
+def create_indexes_command():
+    """Create every index the query paths rely on (idempotent)."""
+    for row in ensure_indexes():
+        click.echo(f"[{row['status']}] {row['collection']}.{row['name']}")
+        for route in row["serves"]:
+            click.echo(f"    serves {route}")
+        if row.get("error"):
+            click.echo(f"    error: {row['error']}")
+
+
+@app.cli.command("refresh-related")
+def refresh_related_command():
+    """Recompute the related-articles table for every published article."""
+    click.echo(f"Refreshed {refresh_related()} articles")
+
+
+@app.cli.command("migrate-dates")
+def migrate_dates_command():
+    """Convert string article dates to BSON datetimes (run once)."""
+    converted, failed = migrate_article_dates()
+    click.echo(f"Converted {converted} articles")
+    for article_id in failed:
+        click.echo(f"    unparseable date on {article_id}")
+
+
+@app.cli.command("reconcile-counts")
+def reconcile_counts_command():
+    """Recompute stored topic / category article counts."""
+    stats = reconcile_counts()
+    for name in ("topics", "categories"):
+        row = stats[name]
+        click.echo(
+            f"{name}: {row['counted']} counted, {row['updated']} updated, "
+            f"{row['missing']} missing"
+        )
+
 
 @app.after_request
 def add_security_headers(response):
@@ -61,6 +113,47 @@ def admin_read_only():
         if request.method != "GET":
             abort(404)
 
+
+# Index creation and cache warm-up run on each worker's first request
+# rather than at import, so `gunicorn --preload` forks before any
+# connection exists and CLI commands never query Mongo.
+_started_pid = None
+_startup_lock = threading.Lock()
+
+
+@app.before_request
+def startup_tasks():
+    global _started_pid
+
+    if _started_pid == os.getpid():
+        return
+
+    with _startup_lock:
+        if _started_pid == os.getpid():
+            return
+        _started_pid = os.getpid()
+
+        logger = logging.getLogger(__name__)
+
+        if app.config["ENSURE_INDEXES_ON_STARTUP"]:
+            try:
+                for row in ensure_indexes():
+                    if row.get("error"):
+                        logger.error(
+                            "Index %s.%s: %s",
+                            row["collection"], row["name"], row["error"]
+                        )
+            except Exception:
+                logger.exception("Index creation failed")
+
+        if app.config["WARM_CACHES_ON_STARTUP"]:
+            try:
+                warm_recent()
+                load_typeahead()
+            except Exception:
+                # Caches fill lazily on first use instead
+                logger.exception("Cache warm-up failed")
+
 app.register_blueprint(article_bp)
 
 # Page routes (HTML)
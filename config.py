@@ -2,3 +2,94 @@ import os
 
 class Config:
     MONGO_URI = os.getenv("MONGO_URI")
+
+    # Connection pool per worker process (driver defaults: 100 / 0 / no limit)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000))
+
+    # Fail fast when no suitable server is reachable; 0 = no socket timeout
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 0))
+
+    # Wire compression in preference order; a compressor whose package the
+    # driver cannot import is skipped (pymongo[snappy,zstd] installs both)
+    MONGO_COMPRESSORS = [
+        c.strip()
+        for c in os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib").split(",")
+        if c.strip()
+    ]
+
+    # Where uncached public reads go (db.mongo.read_db); writes always use
+    # the primary. -1 = no staleness bound, otherwise at least 90 seconds.
+    MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "secondaryPreferred")
+    MONGO_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", -1))
+
+    # Seconds the assembled home page stays in memory between admin writes
+    HOME_CACHE_TTL = int(os.getenv("HOME_CACHE_TTL", 60))
+
+    # Seconds a listing total is reused before count_documents runs again
+    COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", 300))
+
+    # Seconds between batched writes of buffered views to views_hourly
+    VIEW_FLUSH_INTERVAL = int(os.getenv("VIEW_FLUSH_INTERVAL", 10))
+
+    # Seconds between folding hourly view buckets into articles.view_count,
+    # and how long the buckets are kept
+    VIEW_SYNC_INTERVAL = int(os.getenv("VIEW_SYNC_INTERVAL", 300))
+    VIEW_BUCKET_RETENTION_DAYS = int(os.getenv("VIEW_BUCKET_RETENTION_DAYS", 90))
+
+    # Create missing indexes on each worker's first request (or run
+    # `flask create-indexes` once per deploy instead)
+    ENSURE_INDEXES_ON_STARTUP = os.getenv("ENSURE_INDEXES_ON_STARTUP", "false").lower() == "true"
+
+    # Sitemap index / month stats are cheap to rebuild; shards are versioned
+    SITEMAP_INDEX_TTL = int(os.getenv("SITEMAP_INDEX_TTL", 300))
+    SITEMAP_SHARD_TTL = int(os.getenv("SITEMAP_SHARD_TTL", 86400))
+
+    # Related-articles sidebar: in-memory card TTL, and how often rows in
+    # categories touched by article writes are recomputed (one worker per
+    # cycle; 0 disables it). `flask refresh-related` recomputes everything.
+    RELATED_CACHE_TTL = int(os.getenv("RELATED_CACHE_TTL", 300))
+    RELATED_REFRESH_INTERVAL = int(os.getenv("RELATED_REFRESH_INTERVAL", 900))
+
+    # Newest-published ring buffer: reload period across worker processes
+    RECENT_REFRESH_SECONDS = int(os.getenv("RECENT_REFRESH_SECONDS", 60))
+
+    # Load in-process caches (recent articles, typeahead) on each worker's
+    # first request
+    WARM_CACHES_ON_STARTUP = os.getenv("WARM_CACHES_ON_STARTUP", "true").lower() == "true"
+
+    # Seconds between most-read leaderboard rollups
+    LEADERBOARD_ROLLUP_INTERVAL = int(os.getenv("LEADERBOARD_ROLLUP_INTERVAL", 120))
+
+    # Article pages: normalized documents cached per (category, slug).
+    # Admin edits invalidate this worker's entry; others expire within the TTL.
+    ARTICLE_CACHE_SIZE = int(os.getenv("ARTICLE_CACHE_SIZE", 1024))
+    ARTICLE_CACHE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", 300))
+
+    # HTML page validators: seconds a worker reuses the shared content
+    # version before re-reading it, and a release tag mixed into every ETag
+    # (set per deploy so template changes are never served as 304s)
+    CONTENT_VERSION_TTL = int(os.getenv("CONTENT_VERSION_TTL", 5))
+    RELEASE_VERSION = os.getenv("RELEASE_VERSION", "")
+
+    # Seconds a rendered static CMS page (about, policies) stays in memory
+    STATIC_PAGE_CACHE_TTL = int(os.getenv("STATIC_PAGE_CACHE_TTL", 3600))
+
+    # Seconds between checks of the category/author reference version
+    REFERENCE_POLL_SECONDS = int(os.getenv("REFERENCE_POLL_SECONDS", 10))
+
+    # Search: ranked results kept per normalized query until an article write
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 512))
+
+    # Seconds between full rebuilds of the typeahead prefix index
+    # (this worker's own article writes are applied immediately)
+    TYPEAHEAD_REFRESH_INTERVAL = int(os.getenv("TYPEAHEAD_REFRESH_INTERVAL", 600))
+
+    # Seconds between topic / category count reconciliations (0 disables;
+    # run `flask reconcile-counts` instead)
+    COUNT_RECONCILE_INTERVAL = int(os.getenv("COUNT_RECONCILE_INTERVAL", 3600))
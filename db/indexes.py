@@ -0,0 +1,355 @@
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from config import Config
+from db.mongo import mongo
+
+# Every index the query paths rely on, with the routes each one serves.
+# Keys follow equality -> sort order so the sorts never run in memory.
+# Paginated streams end in _id to match utils.pagination.KEYSET_SORT.
+
+PUBLISHED = [("status", ASCENDING), ("is_deleted", ASCENDING)]
+
+INDEXES = [
+    # ---------------- ARTICLES ---------------- #
+    {
+        "collection": "articles",
+        "name": "articles_slug_unique",
+        "keys": [("slug", ASCENDING)],
+        # Soft-deleted articles keep their slug; it is free to reuse
+        "options": {
+            "unique": True,
+            "partialFilterExpression": {"is_deleted": False}
+        },
+        "serves": [
+            "pages.article_page (slug + category.slug)",
+            "article_routes.single_article"
+        ]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_published_at",
+        "keys": PUBLISHED + [
+            ("published_at", DESCENDING),
+            ("_id", DESCENDING)
+        ],
+        "serves": [
+            "pages.article_page (most recent)",
+            "pages.home_page (featured sections)",
+            "article_routes.list_articles",
+            "article_routes.latest",
+            "sitemap.sitemap"
+        ]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_category_published_at",
+        "keys": PUBLISHED + [
+            ("category.slug", ASCENDING),
+            ("published_at", DESCENDING),
+            ("_id", DESCENDING)
+        ],
+        "serves": [
+            "pages.category_page (story stream)",
+            "pages.article_page (more coverage)",
+            "pages.home_page (latest by category)",
+            "category_routes.category_articles",
+            "related.compute_related"
+        ]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_category_featured_published_at",
+        "keys": PUBLISHED + [
+            ("category.slug", ASCENDING),
+            ("is_featured", ASCENDING),
+            ("published_at", DESCENDING)
+        ],
+        "serves": ["pages.category_page (lead story)"]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_topic_published_at",
+        "keys": PUBLISHED + [
+            ("topics.slug", ASCENDING),
+            ("published_at", DESCENDING),
+            ("_id", DESCENDING)
+        ],
+        "serves": [
+            "pages.topic_page (lead story, story stream)",
+            "topic_routes.topic_articles"
+        ]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_author_published_at",
+        "keys": PUBLISHED + [
+            ("author.slug", ASCENDING),
+            ("published_at", DESCENDING)
+        ],
+        "serves": ["pages.author_page"]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_view_count",
+        "keys": PUBLISHED + [("view_count", DESCENDING)],
+        "serves": ["leaderboard.rollup_leaderboards", "pages.home_page (editors pick)"]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_updated_at",
+        "keys": PUBLISHED + [("updated_at", DESCENDING)],
+        "serves": ["sitemap.news_sitemap", "pages.home_page (big story, latest)"]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_admin_created_at",
+        "keys": [("is_deleted", ASCENDING), ("created_at", DESCENDING)],
+        "serves": ["article_routes.admin_list"]
+    },
+    {
+        "collection": "articles",
+        "name": "articles_text_search_index",
+        "keys": [
+            ("title", TEXT),
+            ("excerpt", TEXT),
+            ("content_html", TEXT)
+        ],
+        "options": {
+            "weights": {
+                "title": 10,
+                "excerpt": 5,
+                "content_html": 1
+            }
+        },
+        "serves": ["search.top_results", "search.search (deep pages)"]
+    },
+
+    # ---------------- VIEW ANALYTICS ---------------- #
+    {
+        "collection": "views_hourly",
+        "name": "views_hourly_article_hour_unique",
+        "keys": [("article_id", ASCENDING), ("hour", ASCENDING)],
+        "options": {"unique": True},
+        "serves": ["view_counter.flush_views (bucket upserts)"]
+    },
+    {
+        "collection": "views_hourly",
+        "name": "views_hourly_hour_ttl",
+        "keys": [("hour", ASCENDING)],
+        "options": {
+            "expireAfterSeconds": Config.VIEW_BUCKET_RETENTION_DAYS * 86400
+        },
+        "serves": [
+            "analytics.sync_view_counts",
+            "analytics.view_totals / trending (site)",
+            "leaderboard.rollup_leaderboards (timed windows)"
+        ]
+    },
+    {
+        "collection": "views_hourly",
+        "name": "views_hourly_pending_run",
+        "keys": [("pending.run", ASCENDING)],
+        "options": {"sparse": True},
+        "serves": ["analytics.apply_run / recover_pending"]
+    },
+    {
+        "collection": "views_hourly",
+        "name": "views_hourly_category_hour",
+        "keys": [("category", ASCENDING), ("hour", ASCENDING)],
+        "serves": ["analytics.view_totals / trending (category scope)"]
+    },
+    {
+        "collection": "views_hourly",
+        "name": "views_hourly_topics_hour",
+        "keys": [("topics", ASCENDING), ("hour", ASCENDING)],
+        "serves": ["analytics.view_totals / trending (topic scope)"]
+    },
+
+    # ---------------- CATEGORIES ---------------- #
+    {
+        "collection": "categories",
+        "name": "categories_slug_unique",
+        "keys": [("slug", ASCENDING)],
+        "options": {"unique": True},
+        "serves": ["pages.category_page"]
+    },
+    {
+        "collection": "categories",
+        "name": "categories_active_order",
+        "keys": [("is_active", ASCENDING), ("order", ASCENDING)],
+        "serves": [
+            "pages.home_page (coverage areas)",
+            "pages.about_page",
+            "category_routes.list_categories"
+        ]
+    },
+
+    # ---------------- TOPICS ---------------- #
+    {
+        "collection": "topics",
+        "name": "topics_slug_unique",
+        "keys": [("slug", ASCENDING)],
+        "options": {"unique": True},
+        "serves": ["pages.topic_page", "helper.sync_topics"]
+    },
+    {
+        "collection": "topics",
+        "name": "topics_active_name",
+        "keys": [("is_active", ASCENDING), ("name", ASCENDING)],
+        "serves": ["topic_routes.list_topics"]
+    },
+    {
+        "collection": "topics",
+        "name": "topics_active_article_count",
+        "keys": [("is_active", ASCENDING), ("article_count", DESCENDING)],
+        "serves": ["sitemap.pages_urls (top topics)"]
+    },
+
+    # ---------------- AUTHORS / PAGES / SUBSCRIBERS ---------------- #
+    {
+        "collection": "authors",
+        "name": "authors_slug_unique",
+        "keys": [("slug", ASCENDING)],
+        "options": {"unique": True},
+        "serves": [
+            "pages.author_page",
+            "pages.article_page (author box)",
+            "admin_authors.get_author / update_author / delete_author"
+        ]
+    },
+    {
+        "collection": "pages",
+        "name": "pages_slug_unique",
+        "keys": [("slug", ASCENDING)],
+        "options": {"unique": True},
+        "serves": ["helper.render_static_page", "pages.about_page"]
+    },
+    {
+        "collection": "subscribers",
+        "name": "subscribers_email_unique",
+        "keys": [("email", ASCENDING)],
+        "options": {"unique": True},
+        "serves": ["subscriber_routes.subscribe"]
+    },
+    {
+        "collection": "subscribers",
+        "name": "subscribers_created_at",
+        "keys": [("created_at", DESCENDING)],
+        "serves": ["subscriber_routes.list_subscribers"]
+    }
+]
+
+
+# Options that change what an index enforces or keeps; a stored index that
+# has one the declaration lacks (or vice versa) is rebuilt
+INDEX_OPTIONS = (
+    "unique", "sparse", "expireAfterSeconds", "partialFilterExpression"
+)
+
+
+def keys_match(spec, info):
+    """
+    Text indexes are stored as _fts/_ftsx, so only their name is compared
+    """
+    if any(direction == TEXT for _, direction in spec["keys"]):
+        return True
+
+    return [tuple(k) for k in info["key"]] == [tuple(k) for k in spec["keys"]]
+
+
+def options_match(spec, info):
+    options = spec.get("options", {})
+
+    return all(
+        info.get(name) == options.get(name) for name in INDEX_OPTIONS
+    ) and all(
+        info.get(name) == value for name, value in options.items()
+    )
+
+
+def index_matches(spec, info):
+    return keys_match(spec, info) and options_match(spec, info)
+
+
+def ensure_indexes(only=None):
+    """
+    Create every declared index that is missing. Safe to run repeatedly.
+    Returns one report row per index.
+    """
+    report = []
+    existing = {}
+
+    for spec in INDEXES:
+        if only and spec["name"] not in only:
+            continue
+
+        collection = mongo.db[spec["collection"]]
+
+        if spec["collection"] not in existing:
+            existing[spec["collection"]] = collection.index_information()
+
+        row = {
+            "collection": spec["collection"],
+            "name": spec["name"],
+            "keys": spec["keys"],
+            "serves": spec["serves"]
+        }
+
+        info = existing[spec["collection"]].get(spec["name"])
+
+        if info and index_matches(spec, info):
+            row["status"] = "exists"
+        else:
+            try:
+                if info:
+                    # Declared keys or options changed: rebuild under the
+                    # same name
+                    collection.drop_index(spec["name"])
+
+                collection.create_index(
+                    spec["keys"],
+                    name=spec["name"],
+                    **spec.get("options", {})
+                )
+                row["status"] = "rebuilt" if info else "created"
+            except OperationFailure as e:
+                # e.g. duplicate slugs blocking a unique index
+                row["status"] = "error"
+                row["error"] = str(e)
+
+        report.append(row)
+
+    return report
+
+
+def index_report():
+    """
+    Declared indexes, whether they exist, and the route queries they serve
+    """
+    report = []
+    existing = {}
+
+    for spec in INDEXES:
+        if spec["collection"] not in existing:
+            existing[spec["collection"]] = (
+                mongo.db[spec["collection"]].index_information()
+            )
+
+        info = existing[spec["collection"]].get(spec["name"])
+
+        if not info:
+            status = "missing"
+        elif not index_matches(spec, info):
+            status = "outdated"
+        else:
+            status = "exists"
+
+        report.append({
+            "collection": spec["collection"],
+            "name": spec["name"],
+            "keys": spec["keys"],
+            "serves": spec["serves"],
+            "status": status
+        })
+
+    return report
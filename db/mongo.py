@@ -1,3 +1,83 @@
+import warnings
+
 from flask_pymongo import PyMongo
+from pymongo.compression_support import validate_compressors
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+)
+
+from config import Config
 
 mongo = PyMongo()
+
+# The client defaults to the primary: admin writes, and the reads that
+# refill caches right after a write, always see the latest data. Public
+# page / API reads that are not cached go through read_db() instead, which
+# may be served by a secondary (MONGO_READ_PREFERENCE).
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest
+}
+
+_read_db = None
+
+
+def available_compressors(names):
+    """
+    Configured compressors the driver can load, in preference order. The
+    driver decides which package backs each one (zstd is backports.zstd,
+    or compression.zstd on Python 3.14+), so ask it rather than guess.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return validate_compressors(None, list(names))
+
+
+def client_options():
+    """
+    MongoClient keyword arguments from Config (passed through init_app)
+    """
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+        # 0 = no socket timeout (driver default)
+        "socketTimeoutMS": Config.MONGO_SOCKET_TIMEOUT_MS or None
+    }
+
+    compressors = available_compressors(Config.MONGO_COMPRESSORS)
+    if compressors:
+        options["compressors"] = compressors
+
+    return options
+
+
+def read_preference():
+    mode = READ_PREFERENCES.get(Config.MONGO_READ_PREFERENCE)
+    if mode is None:
+        raise ValueError(
+            f"Invalid MONGO_READ_PREFERENCE: {Config.MONGO_READ_PREFERENCE!r}"
+        )
+
+    if mode is Primary:
+        return Primary()
+    return mode(max_staleness=Config.MONGO_MAX_STALENESS_SECONDS)
+
+
+def read_db():
+    """
+    Database handle for public reads (secondaryPreferred by default)
+    """
+    global _read_db
+
+    if _read_db is None or _read_db.client is not mongo.cx:
+        _read_db = mongo.db.with_options(read_preference=read_preference())
+
+    return _read_db
@@ -1,5 +1,6 @@
 from datetime import datetime
 from slugify import slugify
+from utils.dates import to_datetime
 import math
 
 def calculate_reading_time(content_html):
@@ -43,12 +44,13 @@ def create_article(data):
 
         # Metrics
         "view_count": 0,
+        "last_viewed_at": None,
         "reading_time": calculate_reading_time(content),
 
         # Dates
         # "published_at": data.get("published_at"),
         "published_at": (
-            data.get("published_at")
+            to_datetime(data["published_at"])
             if data.get("published_at")
             else datetime.utcnow() if data.get("status") == "published"
             else None
@@ -59,3 +61,18 @@ def create_article(data):
 
         "is_deleted": False
     }
+
+
+# Fields a list view (card, sidebar, stream) renders: everything but the body
+CARD_FIELDS = [
+    "title", "slug", "excerpt",
+    "featured_image", "image_caption",
+    "type", "category", "author", "topics",
+    "is_featured", "view_count", "reading_time",
+    "published_at", "created_at", "updated_at"
+]
+
+CARD_PROJECTION = {field: 1 for field in CARD_FIELDS}
+
+# Bookkeeping kept out of API responses (sync run ids, see utils.analytics)
+INTERNAL_PROJECTION = {"view_sync_runs": 0}
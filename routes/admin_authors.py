@@ -3,6 +3,7 @@ from datetime import datetime
 from bson import ObjectId
 from db.mongo import mongo
 from models.author_model import create_author
+from utils.cache import content_changed
 
 admin_authors_bp = Blueprint("admin_authors", __name__)
 
@@ -21,6 +22,7 @@ def create_author_api():
 
     author = create_author(data)
     mongo.db.authors.insert_one(author)
+    content_changed("author", author)
 
     return jsonify({
         "message": "Author created successfully",
@@ -31,9 +33,6 @@ def create_author_api():
 def list_authors():
     authors = list(mongo.db.authors.find())
 
-    for a in authors:
-        a["_id"] = str(a["_id"])
-
     return jsonify(authors)
 
 @admin_authors_bp.route("/api/v1/admin/authors/<slug>", methods=["GET"])
@@ -43,7 +42,6 @@ def get_author(slug):
     if not author:
         return jsonify({"error": "Author not found"}), 404
 
-    author["_id"] = str(author["_id"])
     return jsonify(author)
 
 @admin_authors_bp.route("/api/v1/admin/authors/<slug>", methods=["PUT"])
@@ -75,6 +73,7 @@ def update_author(slug):
     if result.matched_count == 0:
         return jsonify({"error": "Author not found"}), 404
 
+    content_changed("author", {"slug": slug})
     return jsonify({"message": "Author updated successfully"})
 
 @admin_authors_bp.route("/api/v1/admin/authors/<slug>", methods=["DELETE"])
@@ -91,4 +90,5 @@ def delete_author(slug):
     if result.matched_count == 0:
         return jsonify({"error": "Author not found"}), 404
 
+    content_changed("author", {"slug": slug})
     return jsonify({"message": "Author deactivated successfully"})
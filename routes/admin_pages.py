@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from bson import ObjectId
 from db.mongo import mongo
+from utils.cache import content_changed
 
 admin_pages_bp = Blueprint("admin_pages", __name__)
 
@@ -87,6 +88,7 @@ def create_page():
     }
 
     mongo.db.pages.insert_one(page)
+    content_changed("page", page)
 
     return jsonify({"message": "Page created", "slug": page["slug"]}), 201
 
@@ -105,6 +107,7 @@ def update_page(slug):
     if res.matched_count == 0:
         return jsonify({"error": "Page not found"}), 404
 
+    content_changed("page", {"slug": slug})
     return jsonify({"message": "Page updated"})
 
 @admin_pages_bp.route("/api/v1/admin/pages", methods=["GET"])
@@ -114,7 +117,4 @@ def list_pages():
         mongo.db.pages.find({}, {"content": 0})
     )
 
-    for p in pages:
-        p["_id"] = str(p["_id"])
-
     return jsonify(pages)
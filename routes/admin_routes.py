@@ -1,6 +1,9 @@
-from flask import Blueprint, jsonify
-from pymongo import TEXT
-from db.mongo import mongo
+from flask import Blueprint, jsonify, request
+from db.indexes import ensure_indexes, index_report
+from utils.analytics import view_totals
+from utils.cache import cache_stats
+from utils.dates import to_datetime
+from utils.counters import last_reconciliation
 
 
 admin_bp = Blueprint("admin", __name__)
@@ -8,23 +11,66 @@ admin_bp = Blueprint("admin", __name__)
 @admin_bp.route("/api/v1/admin/create-search-index", methods=["POST"])
 def create_search_index():
     try:
-        mongo.db.articles.create_index(
-            [
-                ("title", TEXT),
-                ("excerpt", TEXT),
-                # ("author", TEXT),
-                ("content_html", TEXT)
-            ],
-            weights={
-                "title": 10,
-                "excerpt": 5,
-                # "author": 6,
-                "content_html": 1
-            },
-            name="articles_text_search_index"
-        )
+        report = ensure_indexes(only={"articles_text_search_index"})
+
+        if report[0]["status"] == "error":
+            return jsonify({"error": report[0]["error"]}), 500
 
         return jsonify({"message": "Text index created successfully"}), 201
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@admin_bp.route("/api/v1/admin/indexes", methods=["GET"])
+def list_indexes():
+    return jsonify(index_report())
+
+
+@admin_bp.route("/api/v1/admin/cache-stats", methods=["GET"])
+def list_cache_stats():
+    return jsonify(cache_stats())
+
+
+@admin_bp.route("/api/v1/admin/counts", methods=["GET"])
+def count_reconciliation():
+    stats = last_reconciliation()
+
+    if not stats:
+        return jsonify({"error": "Counts have not been reconciled yet"}), 404
+
+    stats.pop("_id")
+    return jsonify(stats)
+
+
+@admin_bp.route("/api/v1/admin/analytics/views", methods=["GET"])
+def article_views():
+    """
+    Views per article over any window: ?since=&until=&scope=&limit=
+    """
+    try:
+        limit = int(request.args.get("limit", 50))
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+
+    try:
+        since = to_datetime(request.args["since"])
+        until = request.args.get("until")
+
+        rows = view_totals(
+            since,
+            until=to_datetime(until) if until else None,
+            scope=request.args.get("scope", "site"),
+            limit=limit
+        )
+    except KeyError:
+        return jsonify({"error": "since is required"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify([
+        {"article_id": row["_id"], "views": row["views"]}
+        for row in rows
+    ])
@@ -1,21 +1,56 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-from db.mongo import mongo
-from models.article_model import create_article
-from utils.helper import sync_topics
+from db.mongo import mongo, read_db
+from models.article_model import (
+    CARD_PROJECTION, INTERNAL_PROJECTION, create_article
+)
+from utils import analytics, leaderboard
+from utils.cache import cached_count, content_changed
+from utils.dates import coerce_dates
+from utils.helper import fields_projection, sync_topics
+from utils.recent import latest_cards
+from utils.related import mark_related_dirty, rebuild_related
+from utils.pagination import KEYSET_SORT, page_args, page_window, split_page
+from utils.view_counter import record_view
 
 article_bp = Blueprint("articles", __name__)
 
+# What sync_topics and mark_related_dirty need from the pre-write document
+TOPIC_FIELDS = {
+    "status": 1,
+    "is_deleted": 1,
+    "topics": 1,
+    "category.slug": 1
+}
+
+
+def category_of(article):
+    return ((article or {}).get("category") or {}).get("slug")
+
 # ---------------- ADMIN CRUD ---------------- #
 
 @article_bp.route("/api/v1/admin/articles", methods=["POST"])
 def create():
     data = request.json
-    article = create_article(data)
-    mongo.db.articles.insert_one(article)
-    if article.get("topics"):
-        sync_topics(article["topics"])
+
+    try:
+        article = create_article(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        mongo.db.articles.insert_one(article)
+    except DuplicateKeyError:
+        return jsonify({"error": "Article with this slug already exists"}), 409
+
+    sync_topics(None, article)
+    if article["status"] == "published":
+        rebuild_related(article)
+        mark_related_dirty(category_of(article))
+    content_changed("article", article)
     return jsonify({"message": "Article created"}), 201
 
 
@@ -23,10 +58,13 @@ def create():
 def update(id):
     data = request.json
 
-    update_data = {
-        **data,
-        "updated_at": datetime.utcnow()
-    }
+    try:
+        update_data = coerce_dates({
+            **data,
+            "updated_at": datetime.utcnow()
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     # If content is updated, mark as editorial update
     if "content_html" in data:
@@ -36,10 +74,26 @@ def update(id):
             "Article updated for clarity"
         )
 
-    mongo.db.articles.update_one(
-        {"_id": ObjectId(id), "is_deleted": False},
-        {"$set": update_data}
-    )
+    try:
+        before = mongo.db.articles.find_one_and_update(
+            {"_id": ObjectId(id), "is_deleted": False},
+            {"$set": update_data},
+            projection=TOPIC_FIELDS,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        return jsonify({"error": "Article with this slug already exists"}), 409
+
+    article = None
+    if before:
+        after = mongo.db.articles.find_one({"_id": ObjectId(id)})
+        sync_topics(before, after)
+        mark_related_dirty(category_of(before), category_of(after))
+
+        if after["status"] == "published" and not after["is_deleted"]:
+            article = after
+            rebuild_related(article)
+    content_changed("article", article or {"_id": ObjectId(id)})
 
     return jsonify({"message": "Article updated"})
 
@@ -47,10 +101,15 @@ def update(id):
 
 @article_bp.route("/api/v1/admin/articles/<id>", methods=["DELETE"])
 def delete(id):
-    mongo.db.articles.update_one(
+    before = mongo.db.articles.find_one_and_update(
         {"_id": ObjectId(id)},
-        {"$set": {"is_deleted": True}}
+        {"$set": {"is_deleted": True}},
+        projection=TOPIC_FIELDS,
+        return_document=ReturnDocument.BEFORE
     )
+    sync_topics(before, None)
+    mark_related_dirty(category_of(before))
+    content_changed("article", {"_id": ObjectId(id)})
     return jsonify({"message": "Article deleted"})
 
 
@@ -62,10 +121,9 @@ def admin_list():
     if status:
         query["status"] = status
 
-    articles = list(mongo.db.articles.find(query).sort("created_at", -1))
-    for a in articles:
-        a["_id"] = str(a["_id"])
-
+    articles = list(
+        mongo.db.articles.find(query, INTERNAL_PROJECTION).sort("created_at", -1)
+    )
     return jsonify(articles)
 
 
@@ -73,32 +131,44 @@ def admin_list():
 
 @article_bp.route("/api/v1/articles", methods=["GET"])
 def list_articles():
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 10))
-    skip = (page - 1) * limit
+    try:
+        page, limit = page_args(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid page or limit"}), 400
 
     query = {"status": "published", "is_deleted": False}
 
-    cursor = (
-        mongo.db.articles
-        .find(query)
-        .sort("published_at", -1)
+    try:
+        projection = fields_projection(request.args.get("fields"))
+    except ValueError:
+        return jsonify({"error": "Invalid fields"}), 400
+
+    try:
+        page_query, skip = page_window(
+            query, page, limit, request.args.get("cursor")
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    articles = list(
+        read_db().articles
+        .find(page_query, projection)
+        .sort(KEYSET_SORT)
         .skip(skip)
-        .limit(limit)
+        .limit(limit + 1)
     )
 
-    articles = []
-    for a in cursor:
-        a["_id"] = str(a["_id"])
-        articles.append(a)
+    articles, has_more, cursor = split_page(articles, limit)
 
-    total = mongo.db.articles.count_documents(query)
+    total = cached_count(mongo.db.articles, query)
 
     return jsonify({
         "data": articles,
         "page": page,
         "limit": limit,
-        "total": total
+        "total": total,
+        "has_more": has_more,
+        "next_cursor": cursor
     })
 
 
@@ -106,45 +176,103 @@ def list_articles():
 @article_bp.route("/api/v1/articles/<slug>", methods=["GET"])
 def single_article(slug):
     # Find the article
-    article = mongo.db.articles.find_one_and_update(
+    article = read_db().articles.find_one(
         {
             "slug": slug,
             "status": "published",
             "is_deleted": False
         },
-        {
-            "$inc": {"view_count": 1},
-            "$set": {"updated_at": datetime.utcnow()}
-        },
-        return_document=True
+        INTERNAL_PROJECTION
     )
 
     if not article:
         return jsonify({"error": "Not found"}), 404
 
-    article["_id"] = str(article["_id"])
+    record_view(article)
+
     return jsonify(article)
 
 
 
 @article_bp.route("/api/v1/articles/latest")
 def latest():
-    articles = mongo.db.articles.find(
-        {"status": "published"}
-    ).sort("published_at", -1).limit(10)
+    fields = request.args.get("fields")
+
+    # Cards come straight from the in-process ring buffer
+    if not fields or fields == "card":
+        articles = latest_cards(10)
+        return jsonify(articles)
+
+    try:
+        projection = fields_projection(fields)
+    except ValueError:
+        return jsonify({"error": "Invalid fields"}), 400
+
+    articles = read_db().articles.find(
+        {"status": "published", "is_deleted": False},
+        projection
+    ).sort(KEYSET_SORT).limit(10)
+
+    return jsonify(list(articles))
+
+
+@article_bp.route("/api/v1/articles/trending")
+def trending():
+    try:
+        hours = int(request.args.get("hours", 24))
+        rows = analytics.trending(
+            scope=request.args.get("scope", "site"),
+            hours=max(1, min(hours, 168)),
+            limit=10
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    by_id = {
+        a["_id"]: a
+        for a in read_db().articles.find(
+            {
+                "_id": {"$in": [row["_id"] for row in rows]},
+                "status": "published",
+                "is_deleted": False
+            },
+            CARD_PROJECTION
+        )
+    }
 
-    return jsonify([{**a, "_id": str(a["_id"])} for a in articles])
+    return jsonify([
+        {
+            **by_id[row["_id"]],
+            "window_views": row["views"],
+            "trend_score": row["score"]
+        }
+        for row in rows
+        if row["_id"] in by_id
+    ])
 
 
 @article_bp.route("/api/v1/articles/most-read")
 def most_read():
-    articles = mongo.db.articles.find(
-        {
-            "status": "published",
-            "is_deleted": False
+    fields = request.args.get("fields")
+
+    try:
+        cards = leaderboard.most_read(
+            window=request.args.get("window", "all"), limit=10
+        )
+        projection = fields_projection(fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Full documents (the default) and other projections re-read the
+    # ranked ids, keeping board order
+    if fields != "card":
+        ids = [a["_id"] for a in cards]
+        by_id = {
+            a["_id"]: a
+            for a in read_db().articles.find({"_id": {"$in": ids}}, projection)
         }
-    ).sort("view_count", -1).limit(10)
+        cards = [by_id[i] for i in ids if i in by_id]
 
-    return jsonify([{**a, "_id": str(a["_id"])} for a in articles])
+    return jsonify(cards)
 
 
@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
 from datetime import datetime
-from db.mongo import mongo
+from db.mongo import mongo, read_db
+from utils.pagination import KEYSET_SORT, page_args, page_window, split_page
 from models.category_model import create_category
+from utils.cache import cached_count, content_changed
+from utils.helper import fields_projection
+from utils.reference import active_categories
 
 category_bp = Blueprint("categories", __name__)
 
@@ -13,6 +17,7 @@ def create():
     data = request.json
     category = create_category(data)
     mongo.db.categories.insert_one(category)
+    content_changed("category", category)
     return jsonify({"message": "Category created"}), 201
 
 
@@ -22,14 +27,13 @@ def update(id):
         {"_id": ObjectId(id)},
         {"$set": {**request.json, "updated_at": datetime.utcnow()}}
     )
+    content_changed("category")
     return jsonify({"message": "Category updated"})
 
 
 @category_bp.route("/api/v1/admin/categories", methods=["GET"])
 def admin_list():
     categories = list(mongo.db.categories.find().sort("order", 1))
-    for c in categories:
-        c["_id"] = str(c["_id"])
     return jsonify(categories)
 
 
@@ -39,6 +43,7 @@ def delete(id):
         {"_id": ObjectId(id)},
         {"$set": {"is_active": False}}
     )
+    content_changed("category")
     return jsonify({"message": "Category disabled"})
 
 
@@ -46,21 +51,15 @@ def delete(id):
 
 @category_bp.route("/api/v1/categories", methods=["GET"])
 def list_categories():
-    categories = list(
-        mongo.db.categories.find(
-            {"is_active": True}
-        ).sort("order", 1)
-    )
-    for c in categories:
-        c["_id"] = str(c["_id"])
-    return jsonify(categories)
+    return jsonify(active_categories())
 
 
 @category_bp.route("/api/v1/categories/<slug>/articles", methods=["GET"])
 def category_articles(slug):
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 10))
-    skip = (page - 1) * limit
+    try:
+        page, limit = page_args(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid page or limit"}), 400
 
     query = {
         "status": "published",
@@ -68,23 +67,36 @@ def category_articles(slug):
         "category.slug": slug
     }
 
+    try:
+        projection = fields_projection(request.args.get("fields"))
+    except ValueError:
+        return jsonify({"error": "Invalid fields"}), 400
+
+    try:
+        page_query, skip = page_window(
+            query, page, limit, request.args.get("cursor")
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
     articles = list(
-        mongo.db.articles
-        .find(query)
-        .sort("published_at", -1)
+        read_db().articles
+        .find(page_query, projection)
+        .sort(KEYSET_SORT)
         .skip(skip)
-        .limit(limit)
+        .limit(limit + 1)
     )
 
-    total = mongo.db.articles.count_documents(query)
+    articles, has_more, cursor = split_page(articles, limit)
 
-    for a in articles:
-        a["_id"] = str(a["_id"])
+    total = cached_count(mongo.db.articles, query)
 
     return jsonify({
         "category": slug,
         "page": page,
         "limit": limit,
         "total": total,
+        "has_more": has_more,
+        "next_cursor": cursor,
         "data": articles
     })
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from db.mongo import mongo
 from datetime import datetime
 from models.contact_model import create_contact_message
+from utils.typeahead import suggest
 
 contact_bp = Blueprint("contact", __name__)
 @contact_bp.route("/api/v1/contact", methods=["POST"])
@@ -25,24 +26,4 @@ def submit_contact():
 
 @contact_bp.route("/api/v1/search")
 def search_api():
-    q = request.args.get("q", "").strip()
-
-    if not q:
-        return jsonify([])
-
-    results = mongo.db.articles.find(
-        {
-            "$text": {"$search": q},
-            "status": "published",
-            "is_deleted": False
-        },
-        {"score": {"$meta": "textScore"}}
-    ).sort([("score", {"$meta": "textScore"})]).limit(5)
-
-    return jsonify([
-        {
-            "title": a["title"],
-            "url": f"/{a['category']['slug']}/{a['slug']}"
-        }
-        for a in results
-    ])
+    return jsonify(suggest(request.args.get("q", "")))
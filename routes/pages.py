@@ -1,9 +1,29 @@
 from flask import Blueprint, jsonify, render_template, abort, request
 from datetime import datetime
-from dateutil import parser
-from db.mongo import mongo
+from config import Config
+from db.mongo import mongo, read_db
+from models.article_model import CARD_PROJECTION
 from models.page_model import create_page
-from utils.helper import normalize_articles, render_static_page
+from utils.cache import (
+    TTLCache, content_changed, on_content_change
+)
+from utils import leaderboard
+from utils.article_lookup import find_article
+from utils.helper import (
+    cached_static_page, normalize_articles, render_static_page
+)
+from utils.http_cache import (
+    body_etag, content_version, not_modified, page_etag, page_response,
+    rendered_response
+)
+from utils.pagination import (
+    KEYSET_SORT, page_number, page_window, split_page
+)
+from utils.recent import latest_cards
+from utils.reference import active_categories, author_by_slug, category_by_slug
+from utils.related import related_cards
+from utils.search import search
+from utils.view_counter import record_view
 from werkzeug.exceptions import HTTPException
 from flask import send_from_directory
 
@@ -42,79 +62,35 @@ def handle_all_errors(e):
 def article_page(category_slug, article_slug):
 
     # ---------------- MAIN ARTICLE ---------------- #
-    article = mongo.db.articles.find_one_and_update(
-        {
-            "slug": article_slug,
-            "category.slug": category_slug,
-            "status": "published",
-            "is_deleted": False
-        },
-        {
-            "$inc": {"view_count": 1},
-            "$set": {"updated_at": datetime.utcnow()}
-        },
-        return_document=True
-    )
+    article_id, article = find_article(category_slug, article_slug)
 
     if not article:
         abort(404)
 
-    # Convert string dates → datetime
-    if isinstance(article.get("published_at"), str):
-        article["published_at"] = parser.parse(article["published_at"])
-
-    if isinstance(article.get("updated_at"), str):
-        article["updated_at"] = parser.parse(article["updated_at"])
-
-    article["_id"] = str(article["_id"])
+    record_view({**article, "_id": article_id})
 
     canonical_url = f"https://todaysus.com/{category_slug}/{article_slug}"
 
     # ---------------- MOST RELEVANT ---------------- #
-    topic_slugs = [t["slug"] for t in article.get("topics", [])]
-
-    relevant_articles = list(
-        mongo.db.articles.find(
-            {
-                "_id": {"$ne": article["_id"]},
-                "status": "published",
-                "is_deleted": False,
-                "category.slug": category_slug,
-                "topics.slug": {"$in": topic_slugs}
-            }
-        )
-        .sort([
-            ("view_count", -1),
-            ("published_at", -1)
-        ])
-        .limit(5)
-    )
+    relevant_articles = related_cards({**article, "_id": article_id})
 
     # ---------------- MOST RECENT ---------------- #
-    recent_articles = list(
-        mongo.db.articles.find(
-            {
-                "status": "published",
-                "is_deleted": False
-            }
-        )
-        .sort("published_at", -1)
-        .limit(5)
-    )
+    recent_articles = latest_cards(5)
 
     # Convert IDs
-    for a in relevant_articles + recent_articles:
+    for a in recent_articles:
         a["_id"] = str(a["_id"])
 
     # ---------------- MORE COVERAGE ---------------- #
     more_coverage = list(
-        mongo.db.articles.find(
+        read_db().articles.find(
             {
-                "_id": {"$ne": article["_id"]},
+                "_id": {"$ne": article_id},
                 "status": "published",
                 "is_deleted": False,
                 "category.slug": category_slug
-            }
+            },
+            CARD_PROJECTION
         )
         .sort("published_at", -1)
         .limit(6)
@@ -127,22 +103,14 @@ def article_page(category_slug, article_slug):
     author = None
 
     if article.get("author") and article["author"].get("slug"):
-        author = mongo.db.authors.find_one(
-            {
-                "slug": article["author"]["slug"],
-                "is_active": True
-            }
-        )
-
-        if author:
-            author["_id"] = str(author["_id"])
+        author = author_by_slug(article["author"]["slug"])
 
     
     # ---------------- ADS FLAG ---------------- #
     show_ads = False  # 🔴 Enable later when ads are ready
 
     # ---------------- RENDER PAGE ---------------- #
-    return render_template(
+    return rendered_response("article", render_template(
         "article.html",
         article=article,
         author=author,
@@ -158,30 +126,34 @@ def article_page(category_slug, article_slug):
 
         # Ads
         show_ads=show_ads
-    )
+    ))
 
 
 @pages_bp.route("/<category_slug>")
 def category_page(category_slug):
-    page = int(request.args.get("page", 1))
+    try:
+        page = page_number(request.args)
+    except ValueError:
+        abort(400)
+
     limit = 10
-    skip = (page - 1) * limit
+
+    most_read = leaderboard.most_read(f"category:{category_slug}")
 
     # ---------------- CATEGORY ---------------- #
-    category = mongo.db.categories.find_one(
-        {"slug": category_slug, "is_active": True}
-    )
+    category = category_by_slug(category_slug)
     if not category:
         abort(404)
 
     # ---------------- LEAD STORY ---------------- #
-    lead_article = mongo.db.articles.find_one(
+    lead_article = read_db().articles.find_one(
         {
             "status": "published",
             "is_deleted": False,
             "category.slug": category_slug,
             "is_featured": True
         },
+        CARD_PROJECTION,
         sort=[("published_at", -1)]
     )
 
@@ -192,8 +164,6 @@ def category_page(category_slug):
         "category.slug": category_slug
     }
 
-    most_read_query = query.copy()
-
     # Exclude lead story from stream to prevent duplication
     if lead_article:
         query["_id"] = {"$ne": lead_article["_id"]}
@@ -203,23 +173,21 @@ def category_page(category_slug):
     #     # "category.slug": category_slug
     # }
 
+    try:
+        page_query, skip = page_window(
+            query, page, limit, request.args.get("cursor")
+        )
+    except ValueError:
+        abort(400)
+
     stream_articles = list(
-        mongo.db.articles
-        .find(query)
-        .sort("published_at", -1)
+        read_db().articles
+        .find(page_query, CARD_PROJECTION)
+        .sort(KEYSET_SORT)
         .skip(skip)
-        .limit(limit)
-    )
-
-    total_articles = mongo.db.articles.count_documents(query)
-    has_more = total_articles > (page * limit)
-
-    # ---------------- MOST READ ---------------- #
-    most_read = list(
-        mongo.db.articles.find(most_read_query)
-        .sort("view_count", -1)
-        .limit(5)
+        .limit(limit + 1)
     )
+    stream_articles, has_more, cursor = split_page(stream_articles, limit)
 
     # ---------------- TOPICS ---------------- #
     topic_map = {}
@@ -230,29 +198,12 @@ def category_page(category_slug):
     topics = [{"slug": k, "name": v} for k, v in topic_map.items()]
 
     # ---------------- DATE FIX ---------------- #
-    def fix_dates(items):
-        for a in items:
-            # published_at
-            if isinstance(a.get("published_at"), str):
-                a["published_at"] = parser.parse(a["published_at"])
-
-            # created_at (IMPORTANT)
-            if isinstance(a.get("created_at"), str):
-                a["created_at"] = parser.parse(a["created_at"])
-
-            # fallback (CRITICAL)
-            if not a.get("published_at"):
-                a["published_at"] = a.get("created_at")
-
-            a["_id"] = str(a["_id"])
-
-
-    fix_dates(stream_articles)
-    fix_dates(most_read)
+    normalize_articles(stream_articles)
+    normalize_articles(most_read)
     if lead_article:
-        fix_dates([lead_article])
+        normalize_articles([lead_article])
 
-    return render_template(
+    return rendered_response("listing", render_template(
         "category.html",
         category=category,
         lead_article=lead_article,
@@ -261,17 +212,23 @@ def category_page(category_slug):
         topics=topics,
         current_year=datetime.utcnow().year,
         page=page,
-        has_more=has_more
-    )
+        has_more=has_more,
+        next_cursor=cursor
+    ))
 
 @pages_bp.route("/topics/<topic_slug>")
 def topic_page(topic_slug):
-    page = int(request.args.get("page", 1))
+    try:
+        page = page_number(request.args)
+    except ValueError:
+        abort(400)
+
     limit = 10
-    skip = (page - 1) * limit
+
+    most_read = leaderboard.most_read(f"topic:{topic_slug}")
 
     # ---------------- TOPIC ---------------- #
-    topic = mongo.db.topics.find_one(
+    topic = read_db().topics.find_one(
         {"slug": topic_slug, "is_active": True}
     )
 
@@ -286,55 +243,36 @@ def topic_page(topic_slug):
     }
 
     # ---------------- LEAD STORY ---------------- #
-    lead_article = mongo.db.articles.find_one(
+    lead_article = read_db().articles.find_one(
         query,
+        CARD_PROJECTION,
         sort=[("published_at", -1)]
     )
 
     # ---------------- STORY STREAM ---------------- #
+    try:
+        page_query, skip = page_window(
+            query, page, limit, request.args.get("cursor")
+        )
+    except ValueError:
+        abort(400)
+
     stream_articles = list(
-        mongo.db.articles
-        .find(query)
-        .sort("published_at", -1)
+        read_db().articles
+        .find(page_query, CARD_PROJECTION)
+        .sort(KEYSET_SORT)
         .skip(skip)
-        .limit(limit)
-    )
-
-    total_articles = mongo.db.articles.count_documents(query)
-    has_more = total_articles > (page * limit)
-
-    # ---------------- MOST READ ---------------- #
-    most_read = list(
-        mongo.db.articles
-        .find(query)
-        .sort("view_count", -1)
-        .limit(5)
+        .limit(limit + 1)
     )
+    stream_articles, has_more, cursor = split_page(stream_articles, limit)
 
     # ---------------- DATE FIX ---------------- #
-    def fix_dates(items):
-        for a in items:
-            # published_at
-            if isinstance(a.get("published_at"), str):
-                a["published_at"] = parser.parse(a["published_at"])
-
-            # created_at (CRITICAL FIX)
-            if isinstance(a.get("created_at"), str):
-                a["created_at"] = parser.parse(a["created_at"])
-
-            # fallback safety
-            if not a.get("published_at"):
-                a["published_at"] = a.get("created_at")
-
-            a["_id"] = str(a["_id"])
-
-
-    fix_dates(stream_articles)
-    fix_dates(most_read)
+    normalize_articles(stream_articles)
+    normalize_articles(most_read)
     if lead_article:
-        fix_dates([lead_article])
+        normalize_articles([lead_article])
 
-    return render_template(
+    return rendered_response("listing", render_template(
         "topic.html",
         topic=topic,
         lead_article=lead_article,
@@ -342,13 +280,17 @@ def topic_page(topic_slug):
         most_read=most_read,
         page=page,
         has_more=has_more,
+        next_cursor=cursor,
         current_year=datetime.utcnow().year
-    )
+    ))
 
 
 @pages_bp.route("/about")
 def about_page():
+    return cached_static_page("about", render_about)
+
 
+def render_about():
     page = mongo.db.pages.find_one(
         {"slug": "about", "is_active": True}
     )
@@ -357,14 +299,7 @@ def about_page():
         abort(404)
 
     # -------- COVERAGE (dynamic like home) -------- #
-    categories = list(
-        mongo.db.categories.find(
-            {"is_active": True}
-        ).sort("order", 1)
-    )
-
-    for c in categories:
-        c["_id"] = str(c["_id"])
+    categories = active_categories()
 
     return render_template(
         "about.html",
@@ -378,18 +313,24 @@ def create_page_api():
     data = request.json
     page = create_page(data)
     mongo.db.pages.insert_one(page)
+    content_changed("page", page)
     return jsonify({"message": "Page created"}), 201
 
 
 @pages_bp.route("/contact")
 def contact_page():
-    return render_template(
+    etag = page_etag("static")
+    cached = not_modified("static", etag)
+    if cached:
+        return cached
+
+    return page_response("static", etag, body=render_template(
         "contact.html",
         seo_title="Contact Today’s US",
         seo_description="Contact the Today’s US newsroom for editorial inquiries, corrections, or general questions.",
         canonical_url="https://todaysus.com/contact",
         current_year=datetime.utcnow().year
-    )
+    ))
 
 
 @pages_bp.route("/editorial-policy")
@@ -417,55 +358,30 @@ def ethics_page():
 #     return render_static_page("terms-of-use", "page.html")
 @pages_bp.route("/privacy-policy")
 def privacy_policy_page():
-    page = mongo.db.pages.find_one(
-        {"slug": "privacy-policy", "is_active": True}
-    )
-    if not page:
-        abort(404)
-
-    return render_template(
-        "legal_page.html",
-        page=page,
-        current_year=datetime.utcnow().year
-    )
+    return render_static_page("privacy-policy", "legal_page.html")
 
 
 @pages_bp.route("/terms-of-use")
 def terms_of_use_page():
-    page = mongo.db.pages.find_one(
-        {"slug": "terms-of-use", "is_active": True}
-    )
-    if not page:
-        abort(404)
-
-    return render_template(
-        "legal_page.html",
-        page=page,
-        current_year=datetime.utcnow().year
-    )
+    return render_static_page("terms-of-use", "legal_page.html")
 
 @pages_bp.route("/authors/<slug>")
 def author_page(slug):
 
-    author = mongo.db.authors.find_one({
-        "slug": slug,
-        "is_active": True,
-        "is_public": True
-    })
+    author = author_by_slug(slug, public=True)
 
     if not author:
         abort(404)
 
-    author["_id"] = str(author["_id"])
-
     # Latest articles by this author
     articles = list(
-        mongo.db.articles.find(
+        read_db().articles.find(
             {
                 "status": "published",
                 "is_deleted": False,
                 "author.slug": slug
-            }
+            },
+            CARD_PROJECTION
         )
         .sort("published_at", -1)
         .limit(10)
@@ -473,88 +389,120 @@ def author_page(slug):
 
     normalize_articles(articles)
 
-    return render_template(
+    return rendered_response("listing", render_template(
         "author.html",
         author=author,
         articles=articles,
         current_year=datetime.utcnow().year
-    )
+    ))
+
+
+# ---------------- HOME CACHE ---------------- #
+# Rendered home page + its ETag, per shared content version: another
+# worker's write moves the version and this worker rebuilds.
+home_cache = TTLCache(ttl=Config.HOME_CACHE_TTL, maxsize=2, name="home")
+
+
+@on_content_change
+def clear_home_cache(kind, doc):
+    home_cache.clear()
 
 
 @pages_bp.route("/")
 def home_page():
+    version, _ = content_version()
+    entry = home_cache.get(version)
+
+    if entry is None:
+        body = render_template(
+            "index.html",
+            **build_home_context(),
+            current_year=datetime.utcnow().year
+        )
+        entry = (body_etag("home", body), body)
+        home_cache.set(version, entry)
+
+    etag, body = entry
+    cached = not_modified("home", etag)
+    if cached:
+        return cached
+
+    return page_response("home", etag, body=body)
+
+
+# (name, extra $match, sort, limit); each runs as its own indexed sub-pipeline
+HOME_SECTIONS = [
+    ("primary_feature", {"is_featured": True}, {"published_at": -1}, 1),
+    ("secondary_features", {"is_featured": False}, {"published_at": -1}, 2),
+    ("latest_politics", {"category.slug": "politics"}, {"published_at": -1}, 3),
+    ("latest_business", {"category.slug": "business"}, {"published_at": -1}, 3),
+    ("latest_news", {"category.slug": "news"}, {"published_at": -1}, 3),
+    ("editors_pick", {"is_featured": True}, {"view_count": -1}, 1),
+    ("big_story", {}, {"updated_at": -1}, 1),
+
+    # Any published article, deleted or not; $in keeps the
+    # (status, is_deleted, updated_at) index usable for the sort
+    (
+        "latest_article",
+        {"is_deleted": {"$in": [False, True]}},
+        {"updated_at": -1},
+        1
+    )
+]
+
+
+def home_section(name, match, sort, limit):
+    """
+    Top `limit` published, non-deleted cards for one section, tagged with
+    the section name
+    """
+    return [
+        {"$match": {"status": "published", "is_deleted": False, **match}},
+        {"$sort": sort},
+        {"$limit": limit},
+        {"$project": CARD_PROJECTION},
+        {"$set": {"_section": name}}
+    ]
 
-    base_query = {
-        "status": "published",
-        "is_deleted": False
-    }
 
-    # ---------------- TODAY'S BRIEFING ---------------- #
-    today_briefing = list(
-        mongo.db.articles.find(base_query)
-        .sort("published_at", -1)
-        .limit(3)
-    )
-    normalize_articles(today_briefing)
+def build_home_context():
 
-    # ---------------- PRIMARY FEATURE ---------------- #
-    primary_feature = mongo.db.articles.find_one(
-        {**base_query, "is_featured": True},
-        sort=[("published_at", -1)]
-    )
-    if primary_feature:
-        normalize_articles([primary_feature])
+    # ---------------- HOME SECTIONS (ONE ROUND TRIP) ---------------- #
+    # Every section used to be its own find(). They now run as $unionWith
+    # sub-pipelines of one aggregation; unlike $facet branches, each one
+    # can use its index and read only the rows it returns.
+    first_section, *other_sections = [
+        home_section(*section) for section in HOME_SECTIONS
+    ]
+    pipeline = first_section + [
+        {"$unionWith": {"coll": "articles", "pipeline": section}}
+        for section in other_sections
+    ]
 
-    # ---------------- SECONDARY FEATURES ---------------- #
-    secondary_features = list(
-        mongo.db.articles.find(
-            {**base_query, "is_featured": False}
-        )
-        .sort("published_at", -1)
-        .limit(2)
-    )
-    normalize_articles(secondary_features)
-
-    # ---------------- LATEST BY CATEGORY ---------------- #
-    def latest_by_category(slug):
-        items = list(
-            mongo.db.articles.find(
-                {**base_query, "category.slug": slug}
-            )
-            .sort("published_at", -1)
-            .limit(3)
-        )
+    sections = {name: [] for name, *_ in HOME_SECTIONS}
+    for row in mongo.db.articles.aggregate(pipeline):
+        sections[row.pop("_section")].append(row)
+
+    for items in sections.values():
         normalize_articles(items)
-        return items
-
-    latest_politics = latest_by_category("politics")
-    latest_business = latest_by_category("business")
-    # latest_technology = latest_by_category("technology")
-    latest_news = latest_by_category("news")
-
-    # ---------------- MOST READ ---------------- #
-    most_read = list(
-        mongo.db.articles.find(base_query)
-        .sort("view_count", -1)
-        .limit(5)
-    )
-    normalize_articles(most_read)
 
-    # ---------------- EDITOR'S PICK ---------------- #
-    editors_pick = mongo.db.articles.find_one(
-        {**base_query, "is_featured": True},
-        sort=[("view_count", -1)]
-    )
-    if editors_pick:
-        normalize_articles([editors_pick])
+    def first(name):
+        items = sections[name]
+        return items[0] if items else None
+
+    today_briefing = normalize_articles(latest_cards(3))
+    primary_feature = first("primary_feature")
+    secondary_features = sections["secondary_features"]
+
+    latest_politics = sections["latest_politics"]
+    latest_business = sections["latest_business"]
+    latest_news = sections["latest_news"]
+
+    most_read = normalize_articles(leaderboard.most_read("site"))
+    editors_pick = first("editors_pick")
 
     # ---------------- EDITORIAL GRID ---------------- #
-    big_story = mongo.db.articles.find_one(
-        base_query,
-        sort=[("updated_at", -1)]
-    )
-    if big_story:
-        normalize_articles([big_story])
+    big_story = first("big_story")
 
     editors_focus = [
         "Why context matters more than speed in political coverage",
@@ -575,14 +523,7 @@ def home_page():
     ]
 
     # ---------------- COVERAGE AREAS ---------------- #
-    coverage_areas = list(
-        mongo.db.categories.find(
-            {"is_active": True}
-        ).sort("order", 1)
-    )
-
-    for c in coverage_areas:
-        c["_id"] = str(c["_id"])
+    coverage_areas = active_categories()
 
     # ---------------- TRUST / STANDARDS ---------------- #
     trust_points = [
@@ -591,17 +532,9 @@ def home_page():
         "Clear labeling (News / Analysis / Opinion)"
     ]
 
-    
-    latest_article = mongo.db.articles.find_one(
-        {"status": "published"},
-        sort=[("updated_at", -1)]
-    )
-
-
-    # ---------------- RENDER ---------------- #
-    return render_template(
-        "index.html",
+    latest_article = first("latest_article")
 
+    return dict(
         # Hero / Briefing
         today_briefing=today_briefing,
 
@@ -628,8 +561,7 @@ def home_page():
         coverage_areas=coverage_areas,
         trust_points=trust_points,
 
-        latest_updated_at = latest_article["updated_at"],
-        current_year=datetime.utcnow().year
+        latest_updated_at = latest_article["updated_at"]
     )
 
 
@@ -638,36 +570,18 @@ def home_page():
 def search_page():
 
     query = request.args.get("q", "").strip()
-    page = int(request.args.get("page", 1))
-    limit = 10
-    skip = (page - 1) * limit
-
-    results = []
-    total = 0
-
-    if query:
-        mongo_query = {
-            "$text": {"$search": query},
-            "status": "published",
-            "is_deleted": False
-        }
-
-        cursor = (
-            mongo.db.articles
-            .find(mongo_query, {"score": {"$meta": "textScore"}})
-            .sort([("score", {"$meta": "textScore"})])
-            .skip(skip)
-            .limit(limit)
-        )
+    try:
+        page = page_number(request.args)
+    except ValueError:
+        abort(400)
 
-        results = list(cursor)
-        total = mongo.db.articles.count_documents(mongo_query)
+    limit = 10
 
-        normalize_articles(results)
+    results, total = search(query, page, limit)
 
     has_more = total > (page * limit)
 
-    return render_template(
+    return rendered_response("search", render_template(
         "search.html",
         query=query,
         results=results,
@@ -676,4 +590,4 @@ def search_page():
         has_more=has_more,
         current_year=datetime.utcnow().year,
         canonical_url=f"https://todaysus.com/search?q={query}"
-    )
+    ))
@@ -1,36 +1,29 @@
-from flask import Blueprint, Response, send_from_directory
+import hashlib
+import math
+from flask import (
+    Blueprint, Response, abort, request, send_from_directory,
+    stream_with_context
+)
 from datetime import datetime, timedelta
-from db.mongo import mongo
-from dateutil import parser
-
-from dateutil import parser
-
-def normalize_datetime(value):
-    """
-    Returns a datetime object safely
-    """
-    if isinstance(value, str):
-        return parser.parse(value)
-    if isinstance(value, datetime):
-        return value
-    return None
-
+from config import Config
+from db.mongo import mongo, read_db
+from utils.cache import TTLCache, on_content_change
+from utils.counters import ensure_counts
+from utils.sitemap_writer import write_sitemapindex, write_urlset
 
 def article_pub_datetime(article):
     """
     Google News–safe publication datetime
     """
     return (
-        normalize_datetime(article.get("published_at"))
-        or normalize_datetime(article.get("updated_at"))
-        or normalize_datetime(article.get("created_at"))
+        article.get("published_at")
+        or article.get("updated_at")
+        or article.get("created_at")
         or datetime.utcnow()
     )
 
 
 def safe_date(value):
-    if isinstance(value, str):
-        value = parser.parse(value)
     if isinstance(value, datetime):
         return value.date()
     return datetime.utcnow().date()
@@ -49,10 +42,221 @@ static_pages = [
     "terms-of-use"
 ]
 
+# ---------------- SHARDING ---------------- #
+# /sitemap.xml is a sitemap index: one "pages" shard (home, static pages,
+# authors, categories, topics) plus one shard per publication month, split
+# again past 50k URLs. A shard is rebuilt only when its month's article
+# count or latest updated_at changes.
+
+SHARD_SIZE = 50000
+
+ARTICLE_URL_FIELDS = {
+    "slug": 1,
+    "category.slug": 1,
+    "published_at": 1,
+    "updated_at": 1
+}
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+index_cache = TTLCache(ttl=Config.SITEMAP_INDEX_TTL, name="sitemap_index")
+shard_cache = TTLCache(
+    ttl=Config.SITEMAP_SHARD_TTL, maxsize=512, name="sitemap_shards"
+)
+
+
+@on_content_change
+def clear_sitemap_index(kind, doc):
+    # Shards revalidate against the fresh month stats on their own
+    index_cache.clear()
+
+
+def month_stats():
+    """
+    {"YYYY-MM": {"count", "lastmod"}} for every month with published articles
+    """
+    stats = index_cache.get("months")
+
+    if stats is None:
+        rows = mongo.db.articles.aggregate([
+            {"$match": PUBLISHED},
+            {"$project": {
+                "month": {"$dateToString": {
+                    "format": "%Y-%m",
+                    "date": {"$ifNull": ["$published_at", "$created_at"]}
+                }},
+                "updated_at": 1
+            }},
+            {"$group": {
+                "_id": "$month",
+                "count": {"$sum": 1},
+                "lastmod": {"$max": "$updated_at"}
+            }},
+            {"$sort": {"_id": -1}}
+        ])
+
+        stats = {
+            row["_id"]: {"count": row["count"], "lastmod": row["lastmod"]}
+            for row in rows
+            if row["_id"]
+        }
+        index_cache.set("months", stats)
+
+    return stats
+
+
+def month_query(month):
+    """
+    Articles published in `month` (created_at when never published)
+    """
+    start = datetime.strptime(month, "%Y-%m")
+    end = (start + timedelta(days=32)).replace(day=1)
+
+    return {
+        **PUBLISHED,
+        "$or": [
+            {"published_at": {"$gte": start, "$lt": end}},
+            {"published_at": None, "created_at": {"$gte": start, "$lt": end}}
+        ]
+    }
+
+
+def shard_names():
+    names = []
+
+    for month, stat in month_stats().items():
+        parts = max(1, math.ceil(stat["count"] / SHARD_SIZE))
+
+        if parts == 1:
+            names.append((f"articles-{month}", stat["lastmod"]))
+        else:
+            for part in range(1, parts + 1):
+                names.append((f"articles-{month}-{part}", stat["lastmod"]))
+
+    return names
+
+
+def cached_xml(key, version, chunks, lastmod=None):
+    """
+    Serve `key` from shard_cache while `version` matches. Otherwise stream
+    a fresh copy from `chunks()` and keep it once it has been fully sent.
+    The ETag comes from the version, so a 304 never builds anything.
+    """
+    entry = shard_cache.get(key)
+
+    if entry is not None and entry["version"] == version:
+        body = entry["body"]
+    else:
+        body = stream_with_context(
+            tee_to_cache(key, version, chunks())
+        )
+
+    response = Response(body, mimetype="application/xml")
+    response.set_etag(hashlib.md5(f"{key}:{version}".encode()).hexdigest())
+
+    if isinstance(lastmod, datetime):
+        response.last_modified = lastmod
+
+    response.headers["Cache-Control"] = "public, max-age=3600"
+
+    return response.make_conditional(request)
+
+
+def tee_to_cache(key, version, chunks):
+    parts = []
+
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+
+    shard_cache.set(key, {
+        "version": version,
+        "body": "".join(parts).encode("utf-8")
+    })
+
+
 @sitemap_bp.route("/sitemap.xml", methods=["GET"])
 def sitemap():
+    shards = [("pages", None)] + shard_names()
+    version = repr(shards)
+
+    def chunks():
+        return write_sitemapindex(
+            {
+                "loc": f"{BASE_URL}/sitemaps/{name}.xml",
+                "lastmod": safe_date(lastmod) if lastmod else None
+            }
+            for name, lastmod in shards
+        )
+
+    return cached_xml("index", version, chunks)
+
+
+@sitemap_bp.route("/sitemaps/pages.xml", methods=["GET"])
+def pages_sitemap():
+    urls = index_cache.get("pages")
+
+    if urls is None:
+        urls = pages_urls()
+        index_cache.set("pages", urls)
+
+    return cached_xml("pages", repr(urls), lambda: write_urlset(urls))
+
+
+@sitemap_bp.route("/sitemaps/articles-<month>.xml", methods=["GET"])
+def articles_sitemap(month):
+    part = 1
+
+    if month.count("-") == 2:
+        month, _, part = month.rpartition("-")
+        if not part.isdigit():
+            abort(404)
+        part = int(part)
+
+    stat = month_stats().get(month)
+
+    if not stat or part < 1 or (part - 1) * SHARD_SIZE >= stat["count"]:
+        abort(404)
+
+    version = f"{stat['count']}:{stat['lastmod']}"
+
+    def chunks():
+        articles = (
+            mongo.db.articles
+            .find(month_query(month), ARTICLE_URL_FIELDS)
+            .sort("_id", 1)
+            .skip((part - 1) * SHARD_SIZE)
+            .limit(SHARD_SIZE)
+        )
+
+        return write_urlset(article_urls(articles))
+
+    return cached_xml(
+        f"articles-{month}-{part}", version, chunks, stat["lastmod"]
+    )
+
+
+def article_urls(articles):
+    for article in articles:
+        slug = article.get("slug")
+        category = article.get("category", {}).get("slug")
+
+        if not slug or not category:
+            continue
+
+        yield {
+            "loc": f"{BASE_URL}/{category}/{slug}",
+            "lastmod": safe_date(
+                article.get("updated_at")
+                or article.get("published_at")
+            ),
+            "changefreq": "weekly",
+            "priority": "0.8"
+        }
+
+
+def pages_urls():
     urls = []
-    # BASE_URL = "https://www.todaysus.com"
 
     # ---------- Home ----------
     urls.append({
@@ -61,7 +265,7 @@ def sitemap():
         "changefreq": "daily",
         "priority": "1.0"
     })
-    
+
     # ---------- Static Pages ----------
     for page in static_pages:
         urls.append({
@@ -70,172 +274,101 @@ def sitemap():
             "changefreq": "monthly",
             "priority": "0.5"
         })
-        
-    # ---------- Static Pages ----------
+
+    # ---------- Authors ----------
     authors = mongo.db.authors.find(
-        {
-            
-            "is_active": True
-        }
+        {"is_active": True},
+        {"slug": 1, "updated_at": 1, "created_at": 1}
     )
-    
+
     for author in authors:
         urls.append({
             "loc": f"{BASE_URL}/authors/{author['slug']}",
-            "lastmod": (
+            "lastmod": safe_date(
                 author.get("updated_at")
                 or author.get("created_at")
-                or datetime.utcnow()
-            ).date(),
+            ),
             "changefreq": "monthly",
             "priority": "0.6"
         })
 
     # ---------- Categories ----------
-    category_slugs = set()
+    # Stored counters (utils.counters) instead of scanning articles
+    ensure_counts()
 
-    articles = mongo.db.articles.find(
-        {
-            "status": "published",
-            "is_deleted": False
-        }
-    )
+    categories = mongo.db.categories.find(
+        {"is_active": True, "article_count": {"$gt": 0}},
+        {"slug": 1, "last_published_at": 1}
+    ).sort("order", 1)
 
-    articles_list = list(articles)
-
-    for article in articles_list:
-        category = article.get("category", {})
-        slug = category.get("slug")
-
-        if slug:
-            category_slugs.add(slug)
-
-    for slug in category_slugs:
+    for category in categories:
         urls.append({
-            "loc": f"{BASE_URL}/{slug}",
-            "lastmod": datetime.utcnow().date(),
+            "loc": f"{BASE_URL}/{category['slug']}",
+            "lastmod": safe_date(category.get("last_published_at")),
             "changefreq": "daily",
             "priority": "0.8"
         })
 
-        # ---------- TRENDING TOPICS ----------
-
-    trending_topics = mongo.db.articles.aggregate([
-        {
-            "$match": {
-                "status": "published",
-                "is_deleted": False,
-                "topics": {"$exists": True, "$ne": []}
-            }
-        },
-        {"$unwind": "$topics"},
-        {
-            "$group": {
-                "_id": "$topics.slug",
-                "article_count": {"$sum": 1},
-                "last_published": {"$max": "$published_at"}
-            }
-        },
-        {"$sort": {"article_count": -1}},   # most articles first
-        {"$limit": 25}                       # ONLY TOP 25 TOPICS
-    ])
+    # ---------- TRENDING TOPICS ----------
+    trending_topics = mongo.db.topics.find(
+        {"is_active": True, "article_count": {"$gt": 0}},
+        {"slug": 1, "last_published_at": 1}
+    ).sort("article_count", -1).limit(25)   # ONLY TOP 25 TOPICS
 
     for topic in trending_topics:
-        if not topic["_id"]:
-            continue
-
         urls.append({
-            "loc": f"{BASE_URL}/topics/{topic['_id']}",
-            "lastmod": 
-                safe_date(topic.get("last_published"))
-                ,
+            "loc": f"{BASE_URL}/topics/{topic['slug']}",
+            "lastmod": safe_date(topic.get("last_published_at")),
             "changefreq": "daily",
             "priority": "0.7"
         })
 
-    
-    # ---------- Articles ----------
-    for article in articles_list:
-        slug = article.get("slug")
-        category = article.get("category", {}).get("slug")
-
-        if not slug or not category:
-            continue
-
-        urls.append({
-            "loc": f"{BASE_URL}/{category}/{slug}",
-            "lastmod": (
-                article.get("updated_at")
-                or article.get("published_at")
-                or datetime.utcnow()
-            ).date(),
-            "changefreq": "weekly",
-            "priority": "0.8"
-        })
-
-    # ---------- Build XML ----------
-    xml = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-
-    for url in urls:
-        xml.append("<url>")
-        xml.append(f"<loc>{url['loc']}</loc>")
-        xml.append(f"<lastmod>{url['lastmod']}</lastmod>")
-        xml.append(f"<changefreq>{url['changefreq']}</changefreq>")
-        xml.append(f"<priority>{url['priority']}</priority>")
-        xml.append("</url>")
-
-    xml.append("</urlset>")
-
-    return Response("\n".join(xml), mimetype="application/xml")
-
+    return urls
 
 
 @sitemap_bp.route("/news-sitemap.xml", methods=["GET"])
 def news_sitemap():
 
-    articles = mongo.db.articles.find(
+    articles = read_db().articles.find(
         {
             "status": "published",
             "is_deleted": False,
             "updated_at": {
                 "$gte": datetime.utcnow() - timedelta(days=7)
             }
+        },
+        {
+            "title": 1,
+            "slug": 1,
+            "category.slug": 1,
+            "published_at": 1,
+            "updated_at": 1,
+            "created_at": 1
         }
     ).sort("updated_at", -1).limit(100)
 
-    xml = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml.append(
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
-        'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
-    )
-
-    for article in articles:
-        category = article.get("category", {}).get("slug")
-        slug = article.get("slug")
-
-        if not category or not slug:
-            continue
-
-        pub_date = article_pub_datetime(article)
-
-        xml.append("<url>")
-        xml.append(f"<loc>{BASE_URL}/{category}/{slug}</loc>")
-        xml.append("<news:news>")
-        xml.append("<news:publication>")
-        xml.append("<news:name>Todays US</news:name>")
-        xml.append("<news:language>en</news:language>")
-        xml.append("</news:publication>")
-        xml.append(
-            f"<news:publication_date>{pub_date.isoformat()}</news:publication_date>"
-        )
-        xml.append(f"<news:title>{article['title']}</news:title>")
-        xml.append("</news:news>")
-        xml.append("</url>")
-
-    xml.append("</urlset>")
+    def urls():
+        for article in articles:
+            category = article.get("category", {}).get("slug")
+            slug = article.get("slug")
+
+            if not category or not slug:
+                continue
+
+            yield {
+                "loc": f"{BASE_URL}/{category}/{slug}",
+                "news": {
+                    "name": "Todays US",
+                    "language": "en",
+                    "publication_date": article_pub_datetime(article).isoformat(),
+                    "title": article["title"]
+                }
+            }
 
-    return Response("\n".join(xml), mimetype="application/xml")
+    return Response(
+        stream_with_context(write_urlset(urls(), news=True)),
+        mimetype="application/xml"
+    )
 
 @sitemap_bp.route("/robots.txt")
 def robots_txt():
@@ -49,6 +49,4 @@ def subscribe():
 @subscriber_bp.route("/api/v1/admin/subscribers", methods=["GET"])
 def list_subscribers():
     subs = list(mongo.db.subscribers.find().sort("created_at", -1))
-    for s in subs:
-        s["_id"] = str(s["_id"])
     return jsonify(subs)
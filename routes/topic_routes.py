@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from bson import ObjectId
 from datetime import datetime
-from db.mongo import mongo
+from db.mongo import mongo, read_db
+from utils.pagination import KEYSET_SORT, page_args, page_window, split_page
+from utils.cache import cached_count, content_changed
+from utils.helper import fields_projection
 
 topic_bp = Blueprint("topics", __name__)
 
@@ -10,8 +13,6 @@ topic_bp = Blueprint("topics", __name__)
 @topic_bp.route("/api/v1/admin/topics", methods=["GET"])
 def admin_list():
     topics = list(mongo.db.topics.find().sort("name", 1))
-    for t in topics:
-        t["_id"] = str(t["_id"])
     return jsonify(topics)
 
 
@@ -21,6 +22,7 @@ def update(id):
         {"_id": ObjectId(id)},
         {"$set": {**request.json, "updated_at": datetime.utcnow()}}
     )
+    content_changed("topic")
     return jsonify({"message": "Topic updated"})
 
 
@@ -30,24 +32,24 @@ def disable(id):
         {"_id": ObjectId(id)},
         {"$set": {"is_active": False}}
     )
+    content_changed("topic")
     return jsonify({"message": "Topic disabled"})
 
 
 @topic_bp.route("/api/v1/topics", methods=["GET"])
 def list_topics():
     topics = list(
-        mongo.db.topics.find({"is_active": True}).sort("name", 1)
+        read_db().topics.find({"is_active": True}).sort("name", 1)
     )
-    for t in topics:
-        t["_id"] = str(t["_id"])
     return jsonify(topics)
 
 
 @topic_bp.route("/api/v1/topics/<slug>/articles", methods=["GET"])
 def topic_articles(slug):
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 10))
-    skip = (page - 1) * limit
+    try:
+        page, limit = page_args(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid page or limit"}), 400
 
     query = {
         "status": "published",
@@ -55,23 +57,36 @@ def topic_articles(slug):
         "topics.slug": slug
     }
 
+    try:
+        projection = fields_projection(request.args.get("fields"))
+    except ValueError:
+        return jsonify({"error": "Invalid fields"}), 400
+
+    try:
+        page_query, skip = page_window(
+            query, page, limit, request.args.get("cursor")
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
     articles = list(
-        mongo.db.articles
-        .find(query)
-        .sort("published_at", -1)
+        read_db().articles
+        .find(page_query, projection)
+        .sort(KEYSET_SORT)
         .skip(skip)
-        .limit(limit)
+        .limit(limit + 1)
     )
 
-    total = mongo.db.articles.count_documents(query)
+    articles, has_more, cursor = split_page(articles, limit)
 
-    for a in articles:
-        a["_id"] = str(a["_id"])
+    total = cached_count(mongo.db.articles, query)
 
     return jsonify({
         "topic": slug,
         "page": page,
         "limit": limit,
         "total": total,
+        "has_more": has_more,
+        "next_cursor": cursor,
         "data": articles
     })
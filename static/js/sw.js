@@ -1,58 +1,17 @@
 // static/sw.js
-// Client-side page caching with TTL by URL type
+// Offline fallback for page navigations.
+// Freshness is left to the server's Cache-Control / ETag headers: every
+// navigation goes to the network (and so through the browser's HTTP cache,
+// which revalidates with 304s); the last good copy is kept for offline use.
 
-const CACHE_NAME = "todaysus-pages-v1";
+const CACHE_NAME = "todaysus-pages-v2";
 
-const TTL = {
-  article: 5 * 60 * 60 * 1000,   // 5 hours
-  category: 5 * 60 * 60 * 1000,  // 5 hours
-  home: 15 * 60 * 1000,          // 15 minutes
-  static: 3 * 24 * 60 * 60 * 1000 // 3 days
-};
-
-function getPageType(url) {
+function isPage(url) {
   const path = new URL(url).pathname;
 
-  if (path === "/") return "home";
-
-  if (
-    path === "/about" ||
-    path === "/privacy-policy" ||
-    path === "/terms-of-use" ||
-    path === "/editorial-policy" ||
-    path === "/corrections" ||
-    path === "/ethics" ||
-    path === "/contact"
-  ) return "static";
-
-  if (path.startsWith("/topics/")) return "category";
-
-  const parts = path.split("/").filter(Boolean);
-
-  // /category/article-slug
-  if (parts.length === 2) return "article";
-
-  // /category
-  if (parts.length === 1) return "category";
-
-  return null;
-}
-
-function withFetchedAt(response) {
-  // Add a timestamp header so we can calculate TTL
-  const headers = new Headers(response.headers);
-  headers.set("x-sw-fetched-at", String(Date.now()));
-  return response.blob().then((body) => new Response(body, {
-    status: response.status,
-    statusText: response.statusText,
-    headers
-  }));
-}
+  if (path.startsWith("/api/") || path.startsWith("/static/")) return false;
 
-function isFresh(cachedResponse, ttlMs) {
-  const fetchedAt = Number(cachedResponse.headers.get("x-sw-fetched-at") || 0);
-  if (!fetchedAt) return false;
-  return (Date.now() - fetchedAt) < ttlMs;
+  return true;
 }
 
 self.addEventListener("install", (event) => {
@@ -61,7 +20,14 @@ self.addEventListener("install", (event) => {
 });
 
 self.addEventListener("activate", (event) => {
-  event.waitUntil(self.clients.claim());
+  // Drop caches from older versions (v1 kept its own TTL timestamps)
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(
+      names.filter((name) => name !== CACHE_NAME).map((name) => caches.delete(name))
+    );
+    await self.clients.claim();
+  })());
 });
 
 self.addEventListener("fetch", (event) => {
@@ -70,36 +36,25 @@ self.addEventListener("fetch", (event) => {
   // Only handle GET
   if (req.method !== "GET") return;
 
-  // Only cache full page navigations (HTML documents)
+  // Only full page navigations (HTML documents)
   if (req.mode !== "navigate") return;
 
-  const type = getPageType(req.url);
-  if (!type) return;
-
-  const ttlMs = TTL[type];
+  if (!isPage(req.url)) return;
 
   event.respondWith((async () => {
     const cache = await caches.open(CACHE_NAME);
-    const cached = await cache.match(req);
-
-    // 1) If cached and fresh -> return cached
-    if (cached && isFresh(cached, ttlMs)) {
-      return cached;
-    }
 
-    // 2) Otherwise try network
     try {
       const network = await fetch(req);
-      // Only cache successful HTML responses
+      // Keep successful HTML responses for offline use
       const contentType = network.headers.get("content-type") || "";
       if (network.ok && contentType.includes("text/html")) {
-        const stamped = await withFetchedAt(network.clone());
-        await cache.put(req, stamped.clone());
-        return stamped;
+        await cache.put(req, network.clone());
       }
       return network;
     } catch (e) {
-      // 3) Offline fallback -> return cached even if stale
+      // Offline fallback -> last good copy
+      const cached = await cache.match(req);
       if (cached) return cached;
       // last fallback
       return new Response("Offline", { status: 503, headers: { "content-type": "text/plain" } });
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from db.mongo import mongo
+
+# Pre-aggregated view analytics. views_hourly holds one row per article per
+# hour: {article_id, hour, views, synced, category, topics}, plus `pending`
+# while a sync run is folding it in. The view counter
+# upserts into it in batches; sync_view_counts() folds new views into the
+# article's view_count every few minutes so the article stays read-mostly.
+
+# How far back sync_view_counts() looks for buckets with unsynced views
+SYNC_LOOKBACK = timedelta(hours=6)
+
+# A run still pending after this long is treated as abandoned and replayed
+STALE_PENDING = timedelta(minutes=10)
+
+# Run ids kept on each article (articles.view_sync_runs) to skip replays
+SYNC_RUNS_KEPT = 20
+
+
+def hour_of(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def scope_match(scope):
+    """
+    "site" | "category:<slug>" | "topic:<slug>" -> bucket filter
+    """
+    if scope == "site":
+        return {}
+
+    kind, _, slug = scope.partition(":")
+
+    if kind == "category" and slug:
+        return {"category": slug}
+    if kind == "topic" and slug:
+        return {"topics": slug}
+
+    raise ValueError("Invalid scope")
+
+
+# ---------------- WRITES ---------------- #
+
+def bucket_upsert(article_id, hour, views, category, topics):
+    return UpdateOne(
+        {"article_id": article_id, "hour": hour},
+        {
+            "$inc": {"views": views},
+            "$setOnInsert": {
+                "synced": 0,
+                "category": category,
+                "topics": topics
+            }
+        },
+        upsert=True
+    )
+
+
+def sync_view_counts(batch_size=500):
+    """
+    Add views not yet counted to articles.view_count.
+
+    Buckets are claimed in batches with a compare-and-set on `synced`,
+    which also records the claimed delta under `pending` for this run.
+    Articles remember their last few run ids, so applying a run is
+    idempotent: a run left pending by a dead worker is replayed by the
+    next sync without counting anything twice.
+    """
+    recover_pending()
+
+    run = ObjectId()
+    now = datetime.utcnow()
+    since = hour_of(now - SYNC_LOOKBACK)
+
+    buckets = mongo.db.views_hourly.find(
+        {"hour": {"$gte": since}, "pending": {"$exists": False}},
+        {"views": 1, "synced": 1}
+    )
+
+    claims = []
+    for b in buckets:
+        synced = b.get("synced", 0)
+        if b["views"] <= synced:
+            continue
+
+        claims.append(UpdateOne(
+            {"_id": b["_id"], "synced": synced, "pending": {"$exists": False}},
+            {"$set": {
+                "synced": b["views"],
+                "pending": {
+                    "run": run,
+                    "delta": b["views"] - synced,
+                    "at": now
+                }
+            }}
+        ))
+
+    if not claims:
+        return 0
+
+    for i in range(0, len(claims), batch_size):
+        mongo.db.views_hourly.bulk_write(
+            claims[i:i + batch_size], ordered=False
+        )
+
+    return apply_run(run)
+
+
+def apply_run(run):
+    """
+    Fold the deltas claimed by `run` into the articles, then release them
+    """
+    deltas = {}
+    last_seen = {}
+
+    claimed = mongo.db.views_hourly.find(
+        {"pending.run": run},
+        {"article_id": 1, "hour": 1, "pending.delta": 1}
+    )
+
+    for b in claimed:
+        article_id = b["article_id"]
+        deltas[article_id] = deltas.get(article_id, 0) + b["pending"]["delta"]
+        last_seen[article_id] = max(
+            last_seen.get(article_id, b["hour"]), b["hour"]
+        )
+
+    if deltas:
+        mongo.db.articles.bulk_write([
+            UpdateOne(
+                {"_id": article_id, "view_sync_runs": {"$ne": run}},
+                {
+                    "$inc": {"view_count": views},
+                    "$max": {"last_viewed_at": last_seen[article_id]},
+                    "$push": {"view_sync_runs": {
+                        "$each": [run], "$slice": -SYNC_RUNS_KEPT
+                    }}
+                }
+            )
+            for article_id, views in deltas.items()
+        ], ordered=False)
+
+    mongo.db.views_hourly.update_many(
+        {"pending.run": run},
+        {"$unset": {"pending": ""}}
+    )
+
+    return len(deltas)
+
+
+def recover_pending():
+    """
+    Finish runs whose worker died between claiming buckets and updating
+    the articles
+    """
+    cutoff = datetime.utcnow() - STALE_PENDING
+
+    for run in mongo.db.views_hourly.distinct(
+        "pending.run", {"pending.at": {"$lt": cutoff}}
+    ):
+        apply_run(run)
+
+
+# ---------------- QUERIES ---------------- #
+
+def view_totals(since, until=None, scope="site", limit=None):
+    """
+    [{_id: article_id, views, category, topics}] for views counted in
+    [since, until), most viewed first
+    """
+    hour = {"$gte": hour_of(since)}
+    if until:
+        hour["$lt"] = until
+
+    pipeline = [
+        {"$match": {"hour": hour, **scope_match(scope)}},
+        {"$group": {
+            "_id": "$article_id",
+            "views": {"$sum": "$views"},
+            "category": {"$first": "$category"},
+            "topics": {"$first": "$topics"}
+        }},
+        {"$sort": {"views": -1, "_id": -1}}
+    ]
+
+    if limit:
+        pipeline.append({"$limit": limit})
+
+    return list(mongo.db.views_hourly.aggregate(pipeline))
+
+
+def trending(scope="site", hours=24, limit=10):
+    """
+    [{_id: article_id, views, previous, score}] ranked by how many more
+    views an article had in the last `hours` than in the `hours` before
+    """
+    now = hour_of(datetime.utcnow())
+    midpoint = now - timedelta(hours=hours - 1)
+    start = midpoint - timedelta(hours=hours)
+
+    rows = mongo.db.views_hourly.aggregate([
+        {"$match": {"hour": {"$gte": start}, **scope_match(scope)}},
+        {"$group": {
+            "_id": "$article_id",
+            "views": {"$sum": {
+                "$cond": [{"$gte": ["$hour", midpoint]}, "$views", 0]
+            }},
+            "previous": {"$sum": {
+                "$cond": [{"$lt": ["$hour", midpoint]}, "$views", 0]
+            }}
+        }}
+    ])
+
+    ranked = []
+    for row in rows:
+        row["score"] = row["views"] - row["previous"]
+        if row["score"] > 0:
+            ranked.append(row)
+
+    ranked.sort(key=lambda r: (r["score"], r["views"]), reverse=True)
+    return ranked[:limit]
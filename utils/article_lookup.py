@@ -0,0 +1,54 @@
+from config import Config
+from db.mongo import mongo
+from utils.cache import TTLCache, on_content_change
+
+# (category_slug, slug) -> normalized published article for article_page.
+# Entries hold (ObjectId, article) with _id as a string;
+# only found articles are cached.
+
+article_cache = TTLCache(
+    ttl=Config.ARTICLE_CACHE_TTL,
+    maxsize=Config.ARTICLE_CACHE_SIZE,
+    name="articles"
+)
+
+
+@on_content_change
+def invalidate_article(kind, doc):
+    if kind != "article":
+        return
+
+    if not doc or "_id" not in doc:
+        article_cache.clear()
+        return
+
+    article_id = doc["_id"]
+    article_cache.invalidate_where(lambda entry: entry[0] == article_id)
+
+
+def find_article(category_slug, slug):
+    """
+    (ObjectId, normalized article) or (None, None). The article dict is a
+    shallow copy; nested values are shared with the cache.
+    """
+    key = (category_slug, slug)
+    entry = article_cache.get(key)
+
+    if entry is None:
+        article = mongo.db.articles.find_one(
+            {
+                "slug": slug,
+                "category.slug": category_slug,
+                "status": "published",
+                "is_deleted": False
+            }
+        )
+
+        if not article:
+            return None, None
+
+        entry = (article["_id"], {**article, "_id": str(article["_id"])})
+        article_cache.set(key, entry)
+
+    article_id, article = entry
+    return article_id, dict(article)
@@ -0,0 +1,45 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_started = {}
+_lock = threading.Lock()
+
+
+def start_periodic(name, interval, fn):
+    """
+    Run fn() every `interval` seconds on a daemon thread.
+    Errors are logged and the loop keeps going.
+    """
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                fn()
+            except Exception:
+                logger.exception("Background job %s failed", name)
+
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def ensure_periodic(name, interval, fn):
+    """
+    start_periodic once per process, so forking servers get their own
+    thread. Returns True the first time it starts in this process.
+    """
+    if not interval or _started.get(name) == os.getpid():
+        return False
+
+    with _lock:
+        if _started.get(name) == os.getpid():
+            return False
+
+        _started[name] = os.getpid()
+        start_periodic(name, interval, fn)
+
+    return True
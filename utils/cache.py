@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+
+_caches = {}
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and an optional LRU bound.
+    Named caches report hit/miss counts through cache_stats().
+    """
+
+    def __init__(self, ttl, maxsize=None, name=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        if name:
+            _caches[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+
+            if self.maxsize and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """
+        Drop every entry whose value matches predicate(value)
+        """
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+# ---------------- CONTENT CHANGE HOOKS ---------------- #
+
+_listeners = []
+
+
+def on_content_change(fn):
+    """
+    Register fn(kind, doc) to run after an admin write
+    """
+    _listeners.append(fn)
+    return fn
+
+
+def content_changed(kind, doc=None):
+    """
+    kind: article | category | topic | author | page
+    """
+    for fn in _listeners:
+        fn(kind, doc)
+
+
+# ---------------- COUNTS ---------------- #
+# Totals for paginated listings, keyed by collection + query shape.
+# Publishing, editing or deleting an article clears them.
+
+count_cache = TTLCache(
+    ttl=Config.COUNT_CACHE_TTL, maxsize=1024, name="counts"
+)
+
+
+def cached_count(collection, query):
+    key = (collection.name, json.dumps(query, sort_keys=True, default=str))
+    total = count_cache.get(key)
+
+    if total is None:
+        total = collection.count_documents(query)
+        count_cache.set(key, total)
+
+    return total
+
+
+@on_content_change
+def clear_counts(kind, doc):
+    if kind == "article":
+        count_cache.clear()
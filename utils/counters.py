@@ -0,0 +1,125 @@
+import time
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import Config
+from db.mongo import mongo
+from utils.background import ensure_periodic
+
+# Stored per-topic / per-category counters: article_count and
+# last_published_at, over published, non-deleted articles. sync_topics keeps
+# topic counts current between runs; reconcile_counts() recomputes both
+# collections from one aggregation and repairs any drift. The last run's
+# stats live in meta.count_reconciliation.
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+
+def live_counts():
+    """
+    ({topic_slug: row}, {category_slug: row}), row = {count, last_published}
+    """
+    group = {
+        "count": {"$sum": 1},
+        "last_published": {"$max": "$published_at"}
+    }
+
+    result = next(mongo.db.articles.aggregate([
+        {"$match": PUBLISHED},
+        {"$project": {
+            "topics.slug": 1,
+            "category.slug": 1,
+            "published_at": 1
+        }},
+        {"$facet": {
+            "topics": [
+                {"$unwind": "$topics"},
+                {"$group": {"_id": "$topics.slug", **group}}
+            ],
+            "categories": [
+                {"$group": {"_id": "$category.slug", **group}}
+            ]
+        }}
+    ]))
+
+    return tuple(
+        {row["_id"]: row for row in result[name] if row["_id"]}
+        for name in ("topics", "categories")
+    )
+
+
+def write_counts(collection, counts):
+    """
+    Bring one collection in line with `counts`; only changed rows are written
+    """
+    ops = []
+    seen = 0
+
+    stored = collection.find(
+        {}, {"slug": 1, "article_count": 1, "last_published_at": 1}
+    )
+
+    for doc in stored:
+        row = counts.get(doc.get("slug"))
+
+        if row:
+            seen += 1
+            expected = (row["count"], row["last_published"])
+        else:
+            expected = (0, None)
+
+        if (doc.get("article_count"), doc.get("last_published_at")) != expected:
+            ops.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {
+                    "article_count": expected[0],
+                    "last_published_at": expected[1]
+                }}
+            ))
+
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+
+    return {
+        "counted": len(counts),
+        "updated": len(ops),
+        # Slugs used by live articles with no document of their own
+        "missing": len(counts) - seen
+    }
+
+
+def reconcile_counts():
+    started = time.monotonic()
+    topics, categories = live_counts()
+
+    stats = {
+        "ran_at": datetime.utcnow(),
+        "topics": write_counts(mongo.db.topics, topics),
+        "categories": write_counts(mongo.db.categories, categories)
+    }
+    stats["duration_ms"] = round((time.monotonic() - started) * 1000)
+
+    mongo.db.meta.replace_one(
+        {"_id": "count_reconciliation"},
+        stats,
+        upsert=True
+    )
+
+    return stats
+
+
+def last_reconciliation():
+    return mongo.db.meta.find_one({"_id": "count_reconciliation"})
+
+
+def ensure_counts():
+    """
+    Start the periodic job; reconcile now if counts were never computed
+    """
+    ensure_periodic(
+        "count-reconcile", Config.COUNT_RECONCILE_INTERVAL, reconcile_counts
+    )
+
+    if not last_reconciliation():
+        reconcile_counts()
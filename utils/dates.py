@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from dateutil import parser
+from pymongo import UpdateOne
+
+from db.mongo import mongo
+
+# Article dates are stored as BSON datetimes (naive UTC). Strings are
+# converted on the way in (create_article, the update route) and by the
+# one-time `flask migrate-dates` command, so read paths never parse.
+
+DATE_FIELDS = ("published_at", "created_at", "updated_at", "last_viewed_at")
+
+
+def to_datetime(value):
+    """
+    ISO string / aware datetime -> naive UTC datetime; other values as-is.
+    Raises ValueError for a string that is not a date.
+    """
+    if isinstance(value, str):
+        try:
+            value = parser.parse(value)
+        except OverflowError as e:
+            raise ValueError(f"Invalid date: {value!r}") from e
+
+    if isinstance(value, datetime) and value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
+
+
+def coerce_dates(doc):
+    """
+    Convert the date fields present in `doc` in place
+    """
+    for field in DATE_FIELDS:
+        if field in doc:
+            doc[field] = to_datetime(doc[field])
+    return doc
+
+
+def migrate_article_dates(batch_size=500):
+    """
+    Rewrite string date fields on every article as datetimes.
+    Returns (converted, [ids that could not be parsed]).
+    """
+    articles = mongo.db.articles.find(
+        {"$or": [{f: {"$type": "string"}} for f in DATE_FIELDS]},
+        {f: 1 for f in DATE_FIELDS}
+    )
+
+    ops = []
+    converted = 0
+    failed = []
+
+    for article in articles:
+        update = {}
+
+        for field in DATE_FIELDS:
+            if isinstance(article.get(field), str):
+                try:
+                    update[field] = to_datetime(article[field])
+                except ValueError:
+                    failed.append(article["_id"])
+
+        if update:
+            ops.append(UpdateOne({"_id": article["_id"]}, {"$set": update}))
+
+        if len(ops) >= batch_size:
+            mongo.db.articles.bulk_write(ops, ordered=False)
+            converted += len(ops)
+            ops = []
+
+    if ops:
+        mongo.db.articles.bulk_write(ops, ordered=False)
+        converted += len(ops)
+
+    return converted, failed
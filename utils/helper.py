@@ -1,43 +1,74 @@
+import re
 from datetime import datetime
 
 from flask import abort, render_template
+from pymongo import UpdateOne
+from config import Config
 from db.mongo import mongo
+from models.article_model import CARD_PROJECTION, INTERNAL_PROJECTION
 from models.topic_model import create_topic
-from dateutil import parser
+from utils.cache import TTLCache, on_content_change
+from utils.http_cache import body_etag, not_modified, page_etag, page_response
 
+FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
 
-def sync_topics(topics):
-    for t in topics:
-        slug = t["slug"]
 
-        existing = mongo.db.topics.find_one({"slug": slug})
+def counted_topics(article):
+    """
+    {slug: name} an article contributes to topic article_count
+    (published and not deleted only)
+    """
+    if (
+        not article
+        or article.get("status") != "published"
+        or article.get("is_deleted")
+    ):
+        return {}
+
+    return {t["slug"]: t["name"] for t in article.get("topics") or []}
+
+
+def sync_topics(before, after):
+    """
+    Apply the article_count change between two states of one article
+    (None for "did not exist") in a single bulk write. New topics are
+    upserted on the unique slug index.
+    """
+    old = counted_topics(before)
+    new = counted_topics(after)
+    now = datetime.utcnow()
+
+    ops = []
+    for slug in old.keys() | new.keys():
+        delta = (slug in new) - (slug in old)
+        if not delta:
+            continue
+
+        update = {"$inc": {"article_count": delta}, "$set": {"updated_at": now}}
+
+        if delta > 0:
+            topic = create_topic(new[slug])
+            for field in ("slug", "article_count", "updated_at"):
+                topic.pop(field)
+            update["$setOnInsert"] = topic
 
-        if existing:
-            mongo.db.topics.update_one(
-                {"_id": existing["_id"]},
-                {
-                    "$inc": {"article_count": 1},
-                    "$set": {"updated_at": datetime.utcnow()}
-                }
-            )
-        else:
-            mongo.db.topics.insert_one(
-                create_topic(t["name"])
-            )
+            if isinstance(after.get("published_at"), datetime):
+                update["$max"] = {"last_published_at": after["published_at"]}
+
+        ops.append(UpdateOne({"slug": slug}, update, upsert=delta > 0))
+
+    if ops:
+        mongo.db.topics.bulk_write(ops, ordered=False)
+
+    return len(ops)
 
 
 
 def normalize_articles(items):
     """
-    Fix dates + ids so templates never crash
+    Date fallback + string ids so templates never crash
     """
     for a in items:
-        if isinstance(a.get("published_at"), str):
-            a["published_at"] = parser.parse(a["published_at"])
-
-        if isinstance(a.get("created_at"), str):
-            a["created_at"] = parser.parse(a["created_at"])
-
         if not a.get("published_at"):
             a["published_at"] = a.get("created_at")
 
@@ -45,17 +76,77 @@ def normalize_articles(items):
     return items
 
 
+def fields_projection(value):
+    """
+    ?fields= -> Mongo projection.
+    "card" is the list-view field set, otherwise a comma list of fields;
+    no value means every public field.
+    published_at is always kept so cursors can be built.
+    """
+    if not value:
+        return INTERNAL_PROJECTION
+
+    if value == "card":
+        return CARD_PROJECTION
+
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    if not all(FIELD_NAME.match(f) for f in fields):
+        raise ValueError("Invalid fields")
+
+    return {**{f: 1 for f in fields}, "published_at": 1}
+
+
+# ---------------- STATIC PAGES ---------------- #
+# Rendered CMS pages, keyed by ETag. The ETag carries the content version,
+# so admin page writes retire every worker's copy; the TTL covers the year
+# in the footer.
+
+static_page_cache = TTLCache(
+    ttl=Config.STATIC_PAGE_CACHE_TTL, maxsize=64, name="static_pages"
+)
+
+
+@on_content_change
+def clear_static_pages(kind, doc):
+    # About lists the active categories
+    if kind in ("page", "category"):
+        static_page_cache.clear()
+
+
+def cached_static_page(key, render):
+    """
+    Response for a static page; render() -> html runs only on a cache miss
+    """
+    version_key = page_etag("static", key)
+    entry = static_page_cache.get(version_key)
+
+    if entry is None:
+        html = render()
+        entry = (body_etag("static", html), html)
+        static_page_cache.set(version_key, entry)
+
+    etag, html = entry
+    cached = not_modified("static", etag)
+    if cached:
+        return cached
+
+    return page_response("static", etag, body=html)
+
+
 def render_static_page(slug, template):
-    page = mongo.db.pages.find_one({
-        "slug": slug,
-        "is_active": True
-    })
-
-    if not page:
-        abort(404)
-
-    return render_template(
-        template,
-        page=page,
-        current_year=datetime.utcnow().year
-    )
+    def render():
+        page = mongo.db.pages.find_one({
+            "slug": slug,
+            "is_active": True
+        })
+
+        if not page:
+            abort(404)
+
+        return render_template(
+            template,
+            page=page,
+            current_year=datetime.utcnow().year
+        )
+
+    return cached_static_page(f"{slug}:{template}", render)
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import datetime
+
+from flask import make_response, request
+
+from config import Config
+from db.mongo import mongo
+from utils.cache import TTLCache, on_content_change
+
+# Validators for the HTML routes. Every admin write bumps one shared content
+# version (meta collection). Pages built only from the request and templates
+# hash that version (page_etag) and can answer 304 before doing any work.
+# Pages assembled from per-worker caches or secondary reads hash the
+# rendered body (body_etag / rendered_response), since those parts can
+# trail the shared version.
+
+CACHE_POLICIES = {
+    "home": "public, max-age=60, stale-while-revalidate=300",
+    "listing": "public, max-age=120, stale-while-revalidate=600",
+    "article": "public, max-age=300, stale-while-revalidate=3600",
+    "search": "public, max-age=60, stale-while-revalidate=300",
+    "static": "public, max-age=86400, stale-while-revalidate=604800"
+}
+
+version_cache = TTLCache(ttl=Config.CONTENT_VERSION_TTL, name="content_version")
+
+
+@on_content_change
+def bump_content_version(kind, doc):
+    mongo.db.meta.update_one(
+        {"_id": "content_version"},
+        {
+            "$inc": {"version": 1},
+            "$set": {"updated_at": datetime.utcnow()}
+        },
+        upsert=True
+    )
+    version_cache.clear()
+
+
+def content_version():
+    """
+    (version, updated_at) of the last admin write
+    """
+    current = version_cache.get("content")
+
+    if current is None:
+        doc = mongo.db.meta.find_one({"_id": "content_version"}) or {}
+        current = (doc.get("version", 0), doc.get("updated_at"))
+        version_cache.set("content", current)
+
+    return current
+
+
+def page_etag(kind, *parts):
+    version, _ = content_version()
+    raw = repr((Config.RELEASE_VERSION, kind, version, parts))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def body_etag(kind, body):
+    """
+    ETag for rendered HTML. It hashes the body itself: the parts (recent
+    ring, reference data, boards, secondary reads) can trail the shared
+    content version, so the version alone could tag two different bodies.
+    """
+    return page_etag(kind, hashlib.md5(body.encode()).hexdigest())
+
+
+def rendered_response(kind, body):
+    """
+    200, or 304 when the client already holds this exact body. For pages
+    rendered per request from per-worker caches and secondary reads, where
+    the content version alone does not pin down the body.
+    """
+    etag = body_etag(kind, body)
+    return not_modified(kind, etag) or page_response(kind, etag, body=body)
+
+
+def page_response(kind, etag, last_modified=None, body=""):
+    """
+    Response carrying the page validators and the Cache-Control for `kind`.
+    last_modified defaults to the time of the last admin write.
+    """
+    response = make_response(body)
+    response.set_etag(etag)
+
+    if last_modified is None:
+        last_modified = content_version()[1]
+    if isinstance(last_modified, datetime):
+        response.last_modified = last_modified
+
+    response.headers["Cache-Control"] = CACHE_POLICIES[kind]
+
+    return response
+
+
+def not_modified(kind, etag, last_modified=None):
+    """
+    A 304 when the request's ETag still matches, else None. A bare
+    If-Modified-Since is not enough: Last-Modified only tracks admin
+    writes, while the ETag also covers boards and RELEASE_VERSION.
+    """
+    if not request.if_none_match:
+        return None
+
+    response = page_response(kind, etag, last_modified)
+    response = response.make_conditional(request)
+
+    return response if response.status_code == 304 else None
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from bson import Decimal128, ObjectId
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback below
+    orjson = None
+
+# App-wide JSON provider (replaces flask-pymongo's bson.json_util one).
+# ObjectId -> hex string, datetimes -> ISO 8601 UTC ("...Z"), Decimal128 ->
+# decimal string, so routes can jsonify Mongo documents as they come back.
+
+if orjson:
+    ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def default(value):
+    """
+    Types the encoder does not know natively
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        # orjson handles these itself; this is the stdlib path
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat() + "Z"
+    if isinstance(value, date):
+        return value.isoformat()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def dumps_bytes(self, obj):
+        if orjson:
+            return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+
+        return json.dumps(
+            obj, default=default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps_bytes(obj), mimetype=self.mimetype
+        )
@@ -0,0 +1,249 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from config import Config
+from db.mongo import mongo
+from models.article_model import CARD_PROJECTION
+from utils.analytics import view_totals
+from utils.background import ensure_periodic
+from utils.cache import on_content_change
+
+# Materialized "most read" lists. A rollup job keeps the top TOP_K cards for
+# every scope ("site", "category:<slug>", "topic:<slug>") and window; views
+# arriving between rollups bump the all-time boards in place.
+#
+# "all" ranks by view_count. Timed windows rank by the hourly buckets in
+# views_hourly (utils.analytics), so every worker sees the same boards.
+#
+# Rollups are single-flight. After an article write the current boards keep
+# being served while one background rollup replaces them.
+
+TOP_K = 10
+
+WINDOWS = {
+    "all": None,
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7)
+}
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+logger = logging.getLogger(__name__)
+
+_boards = {}
+_rolled_up_at = None
+_stale = False
+_lock = threading.Lock()
+_rollup_lock = threading.Lock()
+
+
+def scopes_for(category, topics):
+    scopes = ["site"]
+
+    if category:
+        scopes.append(f"category:{category}")
+
+    for slug in topics or []:
+        scopes.append(f"topic:{slug}")
+
+    return scopes
+
+
+def article_scopes(article):
+    return scopes_for(
+        article.get("category", {}).get("slug"),
+        [t["slug"] for t in article.get("topics", [])]
+    )
+
+
+def note_view(article):
+    article_id = article["_id"]
+
+    with _lock:
+        for scope in article_scopes(article):
+            board = _boards.get((scope, "all"))
+
+            for card in board or []:
+                if card["_id"] == article_id:
+                    card["view_count"] = card.get("view_count", 0) + 1
+                    board.sort(key=view_count, reverse=True)
+                    break
+
+
+def view_count(card):
+    return card.get("view_count", 0)
+
+
+# ---------------- ROLLUP ---------------- #
+
+def top_ids_by_view_count(group_by=None):
+    """
+    {scope_key: [ids]} ranked by view_count; one aggregation per scope type
+    """
+    pipeline = [
+        {"$match": PUBLISHED},
+        {"$project": {"view_count": 1, group_by: 1}}
+    ]
+
+    if group_by == "topics.slug":
+        pipeline.append({"$unwind": "$topics"})
+
+    pipeline.append({"$group": {
+        "_id": f"${group_by}",
+        "ids": {"$topN": {
+            "n": TOP_K,
+            "sortBy": {"view_count": -1},
+            "output": "$_id"
+        }}
+    }})
+
+    return {
+        row["_id"]: row["ids"]
+        for row in mongo.db.articles.aggregate(pipeline, allowDiskUse=True)
+        if row["_id"]
+    }
+
+
+def windowed_ids(since):
+    """
+    {scope: [ids]} ranked by views counted since `since`, plus the totals
+    """
+    rows = view_totals(since)
+
+    by_scope = {}
+    for row in rows:
+        for scope in scopes_for(row.get("category"), row.get("topics")):
+            ids = by_scope.setdefault(scope, [])
+            if len(ids) < TOP_K:
+                ids.append(row["_id"])
+
+    return by_scope, {row["_id"]: row["views"] for row in rows}
+
+
+def rollup_leaderboards():
+    """
+    Rebuild every board; waits if another thread is already rolling up
+    """
+    with _rollup_lock:
+        return build_leaderboards()
+
+
+def build_leaderboards():
+    global _rolled_up_at, _stale
+
+    # Writes landing during the rollup mark the boards stale again
+    _stale = False
+    now = datetime.utcnow()
+    ranked = {}
+
+    # ---------- All time ----------
+    site = (
+        mongo.db.articles
+        .find(PUBLISHED, {"_id": 1})
+        .sort("view_count", -1)
+        .limit(TOP_K)
+    )
+    ranked[("site", "all")] = [a["_id"] for a in site]
+
+    for slug, ids in top_ids_by_view_count("category.slug").items():
+        ranked[(f"category:{slug}", "all")] = ids
+
+    for slug, ids in top_ids_by_view_count("topics.slug").items():
+        ranked[(f"topic:{slug}", "all")] = ids
+
+    # ---------- Timed windows ----------
+    window_views = {}
+    for window, span in WINDOWS.items():
+        if span:
+            by_scope, totals = windowed_ids(now - span)
+            window_views[window] = totals
+            for scope, ids in by_scope.items():
+                ranked[(scope, window)] = ids
+
+    # ---------- Cards ----------
+    all_ids = {i for ids in ranked.values() for i in ids}
+    cards = {
+        a["_id"]: a
+        for a in mongo.db.articles.find(
+            {**PUBLISHED, "_id": {"$in": list(all_ids)}},
+            CARD_PROJECTION
+        )
+    }
+
+    boards = {}
+    for (scope, window), ids in ranked.items():
+        board = []
+        for article_id in ids:
+            if article_id in cards:
+                card = dict(cards[article_id])
+                if window in window_views:
+                    card["window_views"] = window_views[window][article_id]
+                board.append(card)
+        boards[(scope, window)] = board
+
+    with _lock:
+        _boards.clear()
+        _boards.update(boards)
+        _rolled_up_at = now
+
+    return len(boards)
+
+
+@on_content_change
+def expire_leaderboards(kind, doc):
+    """
+    Unpublished / deleted articles drop off after the next rollup
+    """
+    global _stale
+
+    if kind == "article":
+        _stale = True
+
+
+def background_rollup():
+    """
+    Runs on its own thread with _rollup_lock already held
+    """
+    global _stale
+
+    try:
+        build_leaderboards()
+    except Exception:
+        # Previous boards stay up; the next read tries again
+        _stale = True
+        logger.exception("Leaderboard rollup failed")
+    finally:
+        _rollup_lock.release()
+
+
+def most_read(scope="site", window="all", limit=5):
+    """
+    Shallow copies of the top `limit` cards for a scope and window
+    """
+    if window not in WINDOWS:
+        raise ValueError("Invalid window")
+
+    ensure_periodic(
+        "leaderboard-rollup",
+        Config.LEADERBOARD_ROLLUP_INTERVAL,
+        rollup_leaderboards
+    )
+
+    if _rolled_up_at is None:
+        # Nothing to serve yet: one request builds, the rest wait for it
+        with _rollup_lock:
+            if _rolled_up_at is None:
+                try:
+                    build_leaderboards()
+                except Exception:
+                    logger.exception("Leaderboard rollup failed")
+                    return []
+
+    elif _stale and _rollup_lock.acquire(blocking=False):
+        threading.Thread(
+            target=background_rollup, name="leaderboard-refresh", daemon=True
+        ).start()
+
+    with _lock:
+        return [dict(c) for c in _boards.get((scope, window), [])[:limit]]
@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Keyset pagination over (published_at, _id), newest first.
+# The cursor is an opaque token holding the last row of the previous page,
+# so page N costs the same index seek as page one.
+
+KEYSET_SORT = [("published_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc):
+    """
+    Token for the page after `doc` (call before dates are normalized)
+    """
+    value = doc.get("published_at")
+    payload = {"i": str(doc["_id"])}
+
+    if isinstance(value, datetime):
+        payload.update({"t": "d", "p": value.isoformat()})
+    elif isinstance(value, str):
+        payload.update({"t": "s", "p": value})
+    else:
+        payload["t"] = "n"
+
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Returns (published_at, _id); raises ValueError on a malformed token
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+
+        _id = ObjectId(payload["i"])
+
+        if payload["t"] == "d":
+            return datetime.fromisoformat(payload["p"]), _id
+        if payload["t"] == "s":
+            return str(payload["p"]), _id
+        return None, _id
+
+    except (KeyError, TypeError, InvalidId, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def after_cursor(query, cursor):
+    """
+    Restrict `query` to rows sorted after the cursor by KEYSET_SORT.
+
+    Mongo orders dates above strings above null, and $lt only compares
+    within one type, so older-typed rows are added explicitly.
+    """
+    published_at, _id = cursor
+
+    if published_at is None:
+        return {"$and": [query, {"published_at": None, "_id": {"$lt": _id}}]}
+
+    branches = [
+        {"published_at": {"$lt": published_at}},
+        {"published_at": published_at, "_id": {"$lt": _id}}
+    ]
+
+    if isinstance(published_at, datetime):
+        branches.append({"published_at": {"$type": "string"}})
+
+    branches.append({"published_at": None})
+
+    return {"$and": [query, {"$or": branches}]}
+
+
+def split_page(items, limit):
+    """
+    Trim a limit + 1 fetch to one page: (items, has_more, next_cursor).
+    The extra row answers has_more without a count_documents call.
+    """
+    has_more = len(items) > limit and limit > 0
+    items = items[:limit]
+
+    return items, has_more, encode_cursor(items[-1]) if has_more else None
+
+
+def page_number(args):
+    """
+    ?page= from the query string; raises ValueError unless it is a positive
+    integer (a negative skip is rejected by the server)
+    """
+    page = int(args.get("page", 1))
+
+    if page < 1:
+        raise ValueError("Invalid page")
+
+    return page
+
+
+def page_args(args, default_limit=10):
+    """
+    (page, limit) from the query string; raises ValueError unless both are
+    positive integers (Mongo reads limit(0) as "no limit")
+    """
+    page = page_number(args)
+    limit = int(args.get("limit", default_limit))
+
+    if limit < 1:
+        raise ValueError("Invalid page or limit")
+
+    return page, limit
+
+
+def page_window(query, page, limit, token=None):
+    """
+    (query, skip) for a request: keyset when a cursor is given,
+    otherwise the classic page number
+    """
+    if token:
+        return after_cursor(query, decode_cursor(token)), 0
+
+    return query, (page - 1) * limit
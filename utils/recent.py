@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from config import Config
+from db.mongo import mongo
+from models.article_model import CARD_FIELDS, CARD_PROJECTION
+from utils.cache import on_content_change
+from utils.pagination import KEYSET_SORT
+
+# Newest-first ring of published article cards shared by the "latest"
+# widgets (article sidebar, home briefing, /api/v1/articles/latest).
+# Publishing through the admin API pushes onto it; other edits reload it,
+# and RECENT_REFRESH_SECONDS bounds how stale another worker can be.
+
+RECENT_SIZE = 20
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+_recent = deque(maxlen=RECENT_SIZE)
+_lock = threading.Lock()
+_loaded_at = None
+
+
+def warm_recent():
+    global _loaded_at
+
+    articles = list(
+        mongo.db.articles
+        .find(PUBLISHED, CARD_PROJECTION)
+        .sort(KEYSET_SORT)
+        .limit(RECENT_SIZE)
+    )
+
+    with _lock:
+        _recent.clear()
+        _recent.extend(articles)
+        _loaded_at = time.monotonic()
+
+
+def latest_cards(limit):
+    """
+    Shallow copies of the newest `limit` cards (callers normalize in place)
+    """
+    if (
+        _loaded_at is None
+        or time.monotonic() - _loaded_at > Config.RECENT_REFRESH_SECONDS
+    ):
+        warm_recent()
+
+    with _lock:
+        return [dict(a) for a in islice(_recent, limit)]
+
+
+@on_content_change
+def update_recent(kind, doc):
+    if kind != "article":
+        return
+
+    with _lock:
+        head = _recent[0] if _recent else None
+
+        # A brand-new publish that sorts first can simply go on the front
+        if (
+            doc
+            and _loaded_at is not None
+            and doc.get("status") == "published"
+            and not doc.get("is_deleted")
+            and doc.get("_id") not in {a["_id"] for a in _recent}
+            and (head is None or is_newer(doc, head))
+        ):
+            card = {field: doc.get(field) for field in CARD_FIELDS}
+            card["_id"] = doc["_id"]
+            _recent.appendleft(card)
+            return
+
+    warm_recent()
+
+
+def is_newer(a, b):
+    try:
+        return (a["published_at"], a["_id"]) > (b["published_at"], b["_id"])
+    except TypeError:
+        return False
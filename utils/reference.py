@@ -0,0 +1,103 @@
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+from db.mongo import mongo
+from utils.cache import on_content_change
+
+# Active categories and authors, held in memory per process. Category and
+# author admin writes bump meta.reference_version; each worker polls that
+# one document at most every REFERENCE_POLL_SECONDS and reloads when the
+# version moves. Callers get shallow copies with string ids.
+
+_lock = threading.Lock()
+_state = {
+    "version": None,
+    "checked_at": None,
+    "categories": [],
+    "categories_by_slug": {},
+    "authors_by_slug": {}
+}
+
+
+@on_content_change
+def bump_reference_version(kind, doc):
+    if kind not in ("category", "author"):
+        return
+
+    mongo.db.meta.update_one(
+        {"_id": "reference_version"},
+        {
+            "$inc": {"version": 1},
+            "$set": {"updated_at": datetime.utcnow()}
+        },
+        upsert=True
+    )
+
+    # This worker reloads on its next read
+    _state["checked_at"] = None
+
+
+def stored_version():
+    doc = mongo.db.meta.find_one({"_id": "reference_version"}) or {}
+    return doc.get("version", 0)
+
+
+def load_reference(version):
+    categories = list(
+        mongo.db.categories.find(
+            {"is_active": True}
+        ).sort("order", 1)
+    )
+    authors = list(mongo.db.authors.find({"is_active": True}))
+
+    for doc in categories + authors:
+        doc["_id"] = str(doc["_id"])
+
+    with _lock:
+        _state.update(
+            version=version,
+            checked_at=time.monotonic(),
+            categories=categories,
+            categories_by_slug={c["slug"]: c for c in categories},
+            authors_by_slug={a["slug"]: a for a in authors}
+        )
+
+
+def current():
+    checked_at = _state["checked_at"]
+
+    if (
+        checked_at is None
+        or time.monotonic() - checked_at > Config.REFERENCE_POLL_SECONDS
+    ):
+        version = stored_version()
+
+        if version != _state["version"] or checked_at is None:
+            load_reference(version)
+        else:
+            _state["checked_at"] = time.monotonic()
+
+    return _state
+
+
+def active_categories():
+    return [dict(c) for c in current()["categories"]]
+
+
+def category_by_slug(slug):
+    category = current()["categories_by_slug"].get(slug)
+    return dict(category) if category else None
+
+
+def author_by_slug(slug, public=False):
+    """
+    Active author, or None. public=True also requires is_public.
+    """
+    author = current()["authors_by_slug"].get(slug)
+
+    if not author or (public and not author.get("is_public")):
+        return None
+
+    return dict(author)
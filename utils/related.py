@@ -0,0 +1,178 @@
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from config import Config
+from db.mongo import mongo
+from models.article_model import CARD_PROJECTION
+from utils.background import ensure_periodic
+from utils.cache import TTLCache, on_content_change
+
+# "Most relevant" sidebar, precomputed. related_articles holds, per article
+# id, the top ids in the same category ranked by shared topics then recency.
+# Rows are written when an article is published or edited and refreshed by
+# a background job; the rendered cards are also kept in memory.
+
+RELATED_LIMIT = 5
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+related_cache = TTLCache(
+    ttl=Config.RELATED_CACHE_TTL, maxsize=2048, name="related"
+)
+
+
+@on_content_change
+def clear_related_cache(kind, doc):
+    if kind == "article":
+        related_cache.clear()
+
+
+def compute_related(article):
+    topic_slugs = [t["slug"] for t in article.get("topics", [])]
+    category_slug = article.get("category", {}).get("slug")
+
+    if not topic_slugs or not category_slug:
+        return []
+
+    rows = mongo.db.articles.aggregate([
+        {"$match": {
+            **PUBLISHED,
+            "_id": {"$ne": article["_id"]},
+            "category.slug": category_slug,
+            "topics.slug": {"$in": topic_slugs}
+        }},
+        {"$project": {
+            "overlap": {"$size": {
+                "$setIntersection": ["$topics.slug", topic_slugs]
+            }},
+            "published_at": 1
+        }},
+        {"$sort": {"overlap": -1, "published_at": -1}},
+        {"$limit": RELATED_LIMIT}
+    ])
+
+    return [row["_id"] for row in rows]
+
+
+def related_row(ids):
+    return {"$set": {"related": ids, "updated_at": datetime.utcnow()}}
+
+
+def rebuild_related(article):
+    """
+    Recompute one article's row (called at publish / edit time)
+    """
+    ids = compute_related(article)
+
+    mongo.db.related_articles.update_one(
+        {"_id": article["_id"]},
+        related_row(ids),
+        upsert=True
+    )
+    related_cache.invalidate(article["_id"])
+
+    return ids
+
+
+def refresh_related(batch_size=500, categories=None):
+    """
+    Recompute every published article's row, or only those in `categories`
+    """
+    query = dict(PUBLISHED)
+    if categories is not None:
+        query["category.slug"] = {"$in": list(categories)}
+
+    articles = mongo.db.articles.find(
+        query,
+        {"category.slug": 1, "topics.slug": 1}
+    )
+
+    ops = []
+    refreshed = 0
+
+    for article in articles:
+        ops.append(UpdateOne(
+            {"_id": article["_id"]},
+            related_row(compute_related(article)),
+            upsert=True
+        ))
+
+        if len(ops) >= batch_size:
+            mongo.db.related_articles.bulk_write(ops, ordered=False)
+            refreshed += len(ops)
+            ops = []
+
+    if ops:
+        mongo.db.related_articles.bulk_write(ops, ordered=False)
+        refreshed += len(ops)
+
+    related_cache.clear()
+    return refreshed
+
+
+# ---------------- CHANGED CATEGORIES ---------------- #
+# Related rows only rank within a category, so an article write can only
+# reorder rows in its old and new categories. Writes queue those slugs in
+# meta.related_refresh; the periodic job claims the whole queue in one
+# atomic update, so a single worker per cycle recomputes just those.
+
+def mark_related_dirty(*categories):
+    slugs = sorted({c for c in categories if c})
+
+    if slugs:
+        mongo.db.meta.update_one(
+            {"_id": "related_refresh"},
+            {"$addToSet": {"dirty": {"$each": slugs}}},
+            upsert=True
+        )
+
+
+def refresh_changed_related():
+    claimed = mongo.db.meta.find_one_and_update(
+        {"_id": "related_refresh", "dirty.0": {"$exists": True}},
+        {"$set": {"dirty": [], "claimed_at": datetime.utcnow()}}
+    )
+
+    if not claimed:
+        return 0
+
+    try:
+        return refresh_related(categories=claimed["dirty"])
+    except Exception:
+        # Back on the queue for the next run
+        mark_related_dirty(*claimed["dirty"])
+        raise
+
+
+def related_cards(article):
+    """
+    Card dicts for the sidebar, in ranked order
+    """
+    ensure_periodic(
+        "related-refresh",
+        Config.RELATED_REFRESH_INTERVAL,
+        refresh_changed_related
+    )
+
+    cards = related_cache.get(article["_id"])
+    if cards is not None:
+        return cards
+
+    row = mongo.db.related_articles.find_one({"_id": article["_id"]})
+    ids = row["related"] if row else rebuild_related(article)
+
+    by_id = {
+        a["_id"]: a
+        for a in mongo.db.articles.find(
+            {**PUBLISHED, "_id": {"$in": ids}},
+            CARD_PROJECTION
+        )
+    }
+    cards = [by_id[i] for i in ids if i in by_id]
+
+    for c in cards:
+        c["_id"] = str(c["_id"])
+
+    related_cache.set(article["_id"], cards)
+    return cards
@@ -0,0 +1,100 @@
+import re
+
+from config import Config
+from db.mongo import mongo
+from models.article_model import CARD_PROJECTION
+from utils.cache import TTLCache, cached_count, on_content_change
+from utils.helper import normalize_articles
+
+# Full-text search over published articles for the search page (the
+# /api/v1/search typeahead uses the prefix index in utils.typeahead).
+# Queries are normalized first (case, punctuation, whitespace), and the top
+# SEARCH_RESULT_LIMIT ranked cards per normalized query are kept in memory
+# until the next article write.
+
+SEARCH_RESULT_LIMIT = 50
+MAX_QUERY_LENGTH = 100
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+# Everything but word characters, whitespace, phrase quotes and "-" negation
+QUERY_NOISE = re.compile(r"[^\w\s\"-]+")
+
+search_cache = TTLCache(
+    ttl=Config.SEARCH_CACHE_TTL,
+    maxsize=Config.SEARCH_CACHE_SIZE,
+    name="search"
+)
+
+
+@on_content_change
+def clear_search_cache(kind, doc):
+    if kind == "article":
+        search_cache.clear()
+
+
+def normalize_query(q):
+    """
+    "  Election,  RESULTS! " -> "election results"
+    """
+    q = QUERY_NOISE.sub(" ", q or "").casefold()
+    return " ".join(q.split())[:MAX_QUERY_LENGTH].strip()
+
+
+def text_query(query):
+    return {"$text": {"$search": query}, **PUBLISHED}
+
+
+def find_ranked(query, skip=0, limit=SEARCH_RESULT_LIMIT):
+    articles = list(
+        mongo.db.articles
+        .find(
+            text_query(query),
+            {**CARD_PROJECTION, "score": {"$meta": "textScore"}}
+        )
+        .sort([("score", {"$meta": "textScore"})])
+        .skip(skip)
+        .limit(limit)
+    )
+    return normalize_articles(articles)
+
+
+def top_results(query):
+    """
+    Cached ranked cards for a normalized query (shared; do not mutate)
+    """
+    results = search_cache.get(query)
+
+    if results is None:
+        results = find_ranked(query)
+        search_cache.set(query, results)
+
+    return results
+
+
+def search(q, page=1, per_page=10):
+    """
+    (cards, total) for one page of results. Pages inside the cached top
+    results are sliced from memory; deeper pages query Mongo.
+    """
+    query = normalize_query(q)
+
+    if not query or page < 1:
+        return [], 0
+
+    results = top_results(query)
+    start = (page - 1) * per_page
+
+    # A short result list is the whole result set
+    if len(results) < SEARCH_RESULT_LIMIT:
+        total = len(results)
+    else:
+        total = cached_count(mongo.db.articles, text_query(query))
+
+    if start + per_page <= len(results) or total == len(results):
+        cards = [dict(a) for a in results[start:start + per_page]]
+    else:
+        cards = find_ranked(query, skip=start, limit=per_page)
+
+    return cards, total
+
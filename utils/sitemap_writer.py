@@ -0,0 +1,93 @@
+from xml.sax.saxutils import escape
+
+# Generator-based sitemap XML: chunks are yielded while the Mongo cursor
+# advances, so a response never holds the whole document in memory.
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+NEWS_NS = "http://www.google.com/schemas/sitemap-news/0.9"
+
+# Entries per yielded chunk
+CHUNK_SIZE = 200
+
+
+def url_entry(url):
+    """
+    One <url> element. Keys: loc, lastmod, changefreq, priority, news
+    """
+    xml = ["<url>", f"<loc>{escape(url['loc'])}</loc>"]
+
+    if url.get("lastmod"):
+        xml.append(f"<lastmod>{url['lastmod']}</lastmod>")
+    if url.get("changefreq"):
+        xml.append(f"<changefreq>{url['changefreq']}</changefreq>")
+    if url.get("priority"):
+        xml.append(f"<priority>{url['priority']}</priority>")
+
+    news = url.get("news")
+    if news:
+        xml.append("<news:news>")
+        xml.append("<news:publication>")
+        xml.append(f"<news:name>{escape(news['name'])}</news:name>")
+        xml.append(f"<news:language>{news['language']}</news:language>")
+        xml.append("</news:publication>")
+        xml.append(
+            "<news:publication_date>"
+            f"{news['publication_date']}"
+            "</news:publication_date>"
+        )
+        xml.append(f"<news:title>{escape(news['title'])}</news:title>")
+        xml.append("</news:news>")
+
+    xml.append("</url>")
+
+    return "\n".join(xml)
+
+
+def sitemap_entry(entry):
+    """
+    One <sitemap> element of a sitemap index. Keys: loc, lastmod
+    """
+    xml = ["<sitemap>", f"<loc>{escape(entry['loc'])}</loc>"]
+
+    if entry.get("lastmod"):
+        xml.append(f"<lastmod>{entry['lastmod']}</lastmod>")
+
+    xml.append("</sitemap>")
+
+    return "\n".join(xml)
+
+
+def chunked(opening, entries, render, closing):
+    yield XML_HEADER + opening
+
+    buffer = []
+    for entry in entries:
+        buffer.append(render(entry))
+
+        if len(buffer) >= CHUNK_SIZE:
+            yield "\n" + "\n".join(buffer)
+            buffer = []
+
+    if buffer:
+        yield "\n" + "\n".join(buffer)
+
+    yield "\n" + closing
+
+
+def write_urlset(urls, news=False):
+    opening = f'<urlset xmlns="{SITEMAP_NS}"'
+    if news:
+        opening += f' xmlns:news="{NEWS_NS}"'
+    opening += ">"
+
+    return chunked(opening, urls, url_entry, "</urlset>")
+
+
+def write_sitemapindex(entries):
+    return chunked(
+        f'<sitemapindex xmlns="{SITEMAP_NS}">',
+        entries,
+        sitemap_entry,
+        "</sitemapindex>"
+    )
@@ -0,0 +1,166 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from config import Config
+from db.mongo import mongo
+from utils.background import ensure_periodic
+from utils.cache import on_content_change
+
+# In-memory prefix index behind the /api/v1/search typeahead. Every word of a
+# published article's title and topic names goes into one sorted list of
+# (token, article_id) pairs; a prefix lookup is a bisect plus a short scan.
+# Built at startup, patched in place on article writes, and rebuilt every
+# TYPEAHEAD_REFRESH_INTERVAL to pick up other workers' writes.
+
+PUBLISHED = {"status": "published", "is_deleted": False}
+
+# Typeahead waits for this many characters before searching
+MIN_SUGGEST_LENGTH = 2
+
+# Upper bound on index entries read per lookup (very short prefixes)
+MAX_SCAN = 2000
+
+WORD = re.compile(r"\w+")
+
+FIELDS = {
+    "title": 1,
+    "slug": 1,
+    "category.slug": 1,
+    "topics.name": 1,
+    "published_at": 1
+}
+
+_lock = threading.Lock()
+_entries = []   # sorted [(token, article_id)]
+_docs = {}      # article_id -> (title, url, published_at, tokens)
+_loaded_at = None
+
+
+def tokenize(text):
+    return [w for w in WORD.findall((text or "").casefold()) if len(w) > 1]
+
+
+def index_doc(article):
+    """
+    (article_id, (title, url, published_at, tokens)) for one article
+    """
+    words = tokenize(article.get("title"))
+    for topic in article.get("topics") or []:
+        words += tokenize(topic.get("name"))
+
+    category = (article.get("category") or {}).get("slug")
+
+    return str(article["_id"]), (
+        article["title"],
+        f"/{category}/{article['slug']}",
+        article.get("published_at"),
+        tuple(sorted(set(words)))
+    )
+
+
+def load_typeahead():
+    global _entries, _docs, _loaded_at
+
+    docs = dict(
+        index_doc(a)
+        for a in mongo.db.articles.find(PUBLISHED, FIELDS)
+        if a.get("title") and a.get("slug")
+    )
+    entries = sorted(
+        (token, article_id)
+        for article_id, doc in docs.items()
+        for token in doc[3]
+    )
+
+    with _lock:
+        _entries, _docs = entries, docs
+        _loaded_at = time.monotonic()
+
+
+def remove(article_id):
+    doc = _docs.pop(article_id, None)
+    if not doc:
+        return
+
+    for token in doc[3]:
+        i = bisect_left(_entries, (token, article_id))
+        if i < len(_entries) and _entries[i] == (token, article_id):
+            del _entries[i]
+
+
+@on_content_change
+def update_typeahead(kind, doc):
+    if kind != "article" or _loaded_at is None:
+        return
+
+    if not doc or "_id" not in doc:
+        load_typeahead()
+        return
+
+    with _lock:
+        remove(str(doc["_id"]))
+
+        if (
+            doc.get("status") == "published"
+            and not doc.get("is_deleted")
+            and doc.get("title")
+            and doc.get("slug")
+        ):
+            article_id, entry = index_doc(doc)
+            _docs[article_id] = entry
+            for token in entry[3]:
+                insort(_entries, (token, article_id))
+
+
+def prefix_matches(prefix):
+    """
+    Ids of articles with a token starting with `prefix` (lock held)
+    """
+    ids = set()
+    i = bisect_left(_entries, (prefix,))
+
+    for token, article_id in _entries[i:i + MAX_SCAN]:
+        if not token.startswith(prefix):
+            break
+        ids.add(article_id)
+
+    return ids
+
+
+def suggest(q, limit=5):
+    """
+    [{title, url}] for articles matching every word of `q` as a prefix;
+    titles starting with the query first, then newest
+    """
+    ensure_periodic(
+        "typeahead-refresh", Config.TYPEAHEAD_REFRESH_INTERVAL, load_typeahead
+    )
+
+    if _loaded_at is None:
+        load_typeahead()
+
+    terms = WORD.findall((q or "").casefold())
+    text = " ".join(terms)
+
+    if len(text) < MIN_SUGGEST_LENGTH:
+        return []
+
+    with _lock:
+        ids = None
+        for term in sorted(terms, key=len, reverse=True):
+            matches = prefix_matches(term)
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                return []
+
+        docs = [_docs[i] for i in ids]
+
+    docs.sort(key=lambda d: d[2] or datetime.min, reverse=True)
+    docs.sort(
+        key=lambda d: not " ".join(WORD.findall(d[0].casefold())).startswith(text)
+    )
+
+    return [{"title": d[0], "url": d[1]} for d in docs[:limit]]
@@ -0,0 +1,106 @@
+import atexit
+import threading
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from config import Config
+from db.mongo import mongo
+from utils.analytics import bucket_upsert, hour_of, sync_view_counts
+from utils.background import ensure_periodic
+from utils.leaderboard import note_view
+
+# Views are counted in memory and upserted in batches into hourly buckets
+# (views_hourly, see utils.analytics), so an article read never writes to
+# the article itself. view_count is folded in by sync_view_counts().
+
+SHARD_COUNT = 16
+
+_shards = [({}, threading.Lock()) for _ in range(SHARD_COUNT)]
+
+
+def record_view(article):
+    """
+    Count one read of `article` (the raw document, ObjectId _id)
+    """
+    article_id = article["_id"]
+    key = (article_id, hour_of(datetime.utcnow()))
+    counts, lock = _shards[hash(article_id) % SHARD_COUNT]
+
+    with lock:
+        entry = counts.get(key)
+        if entry is None:
+            entry = counts[key] = {
+                "views": 0,
+                "category": article.get("category", {}).get("slug"),
+                "topics": [t["slug"] for t in article.get("topics", [])]
+            }
+        entry["views"] += 1
+
+    note_view(article)
+    ensure_flusher()
+
+
+def add_pending(pending):
+    for key, entry in pending.items():
+        counts, lock = _shards[hash(key[0]) % SHARD_COUNT]
+        with lock:
+            if key in counts:
+                counts[key]["views"] += entry["views"]
+            else:
+                counts[key] = entry
+
+
+def drain():
+    """
+    Take every buffered count out of the shards
+    """
+    pending = {}
+
+    for counts, lock in _shards:
+        with lock:
+            pending.update(counts)
+            counts.clear()
+
+    return pending
+
+
+def flush_views():
+    pending = drain()
+
+    if not pending:
+        return 0
+
+    # Same order as ops, to map writeErrors back to their bucket
+    keys = list(pending)
+    ops = [
+        bucket_upsert(
+            article_id, hour, entry["views"],
+            entry["category"], entry["topics"]
+        )
+        for (article_id, hour), entry in pending.items()
+    ]
+
+    try:
+        mongo.db.views_hourly.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        # The rest of the batch was applied; re-buffer only the failed
+        # upserts (e.g. two workers inserting the same new bucket)
+        add_pending({
+            keys[error["index"]]: pending[keys[error["index"]]]
+            for error in e.details.get("writeErrors", [])
+        })
+        raise
+    except PyMongoError:
+        # Keep the counts for the next flush instead of dropping them
+        add_pending(pending)
+        raise
+
+    return len(ops)
+
+
+def ensure_flusher():
+    if ensure_periodic("view-counter", Config.VIEW_FLUSH_INTERVAL, flush_views):
+        atexit.register(flush_views)
+
+    ensure_periodic("view-sync", Config.VIEW_SYNC_INTERVAL, sync_view_counts)